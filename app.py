@@ -1,6 +1,13 @@
-from flask import Flask, request, jsonify, render_template
+import time
+_startup = time.perf_counter()
+
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
 from datetime import datetime, timezone
+import importlib.util
 import os
+import io
+import csv
+import itertools
 import json
 import random
 import sys
@@ -17,44 +24,78 @@ platforms_path = os.path.join(BASE_DIR, 'osint_modules', 'platforms.json')
 if not os.path.exists(platforms_path):
     print(f"\n[!] WARNING: 'platforms.json' not found at {platforms_path}")
 
-from helpers.case_manager import create_case, update_case, add_evidence, save_analyst_notes
+from helpers.case_manager import (create_case, update_case, add_evidence, add_evidence_many, iter_evidence,
+                                  save_analyst_notes, load_case_file, get_case, list_cases, find_cases)
+from helpers.pipeline import Pipeline, Stage
+from helpers.job_manager import JobManager, BULK_WORKERS, STREAM_WORKERS
+from helpers import lazy_modules
+from helpers.lazy_modules import lazy
 
 # ===============================
 # IMPORT INTELLIGENCE MODULES
 # ===============================
-# ===== CORE MODULES (must load) =====
-from osint_modules.username_osint import check_username
-from osint_modules.phone_osint import phone_lookup
-from osint_modules.email_osint import email_osint
-from osint_modules.profile_extract import extract_github_profile
-from osint_modules.confidence_score import calculate_identity_confidence
-from osint_modules.correlate import correlate
-from osint_modules.risk_score import calculate_risk
-from osint_modules.google_osint import google_osint
-from osint_modules.account_enum import run_account_enum
-from osint_modules.advanced_search import run_advanced_search
-from osint_modules.breach_check import simple_breach_check
-
-print("[+] Core OSINT modules loaded")
+# ===== CORE MODULES (imported when a stage first calls them) =====
+check_username = lazy("osint_modules.username_osint", "check_username")
+check_wayback_batch = lazy("osint_modules.username_osint", "check_wayback_batch")
+phone_lookup = lazy("osint_modules.phone_osint", "phone_lookup")
+phone_lookup_many = lazy("osint_modules.phone_osint", "phone_lookup_many")
+email_osint = lazy("osint_modules.email_osint", "email_osint")
+extract_github_profile = lazy("osint_modules.profile_extract", "extract_github_profile")
+calculate_identity_confidence = lazy("osint_modules.confidence_score", "calculate_identity_confidence")
+correlate = lazy("osint_modules.correlate", "correlate")
+calculate_risk = lazy("osint_modules.risk_score", "calculate_risk")
+google_osint = lazy("osint_modules.google_osint", "google_osint")
+run_account_enum = lazy("osint_modules.account_enum", "run_account_enum")
+run_advanced_search = lazy("osint_modules.advanced_search", "run_advanced_search")
+simple_breach_check = lazy("osint_modules.breach_check", "simple_breach_check")
+
+# ===== INFRASTRUCTURE (light, loaded now) =====
+from osint_modules import host_guard
+from osint_modules.http_client import get_pool_stats
+from osint_modules.result_cache import cache_stats, get_cache, MISSING
+from osint_modules.platform_priority import priority
+from osint_modules.platform_registry import registry
+from osint_modules import demographics, rescan
 
 # ===== OPTIONAL LIBRARIES (may fail) =====
-try:
-    import gender_guesser.detector as gender
-except ImportError as e:
-    gender = None
-    print("[!] gender_guesser missing:", e)
-
-try:
-    import phonenumbers
-except ImportError as e:
-    phonenumbers = None
-    print("[!] phonenumbers missing:", e)
+# Only checked for here; the modules that use them import them on first use
+for _lib in ("gender_guesser", "phonenumbers"):
+    if importlib.util.find_spec(_lib) is None:
+        print(f"[!] {_lib} missing")
 
 
 app = Flask(__name__)
 
-current_case_id = None
-latest_result = {}
+def save_job(snapshot):
+    update_case(snapshot["case_id"], snapshot, "job.json")
+
+# Jobs run, stream and cancel in the worker process that accepted them. Their
+# snapshots are saved to the case store, so /check_status/<case_id> answers
+# from any worker. Routes keyed by job or batch id (/jobs/<id>, its events and
+# cancel, /bulk_scan/<batch_id>) only work on that worker: under several
+# workers, route them there (sticky sessions) or run a single worker.
+jobs = JobManager(persist=save_job)
+stream_jobs = JobManager(max_workers=STREAM_WORKERS, persist=save_job)
+bulk_jobs = JobManager(max_workers=BULK_WORKERS, persist=save_job)
+MAX_BULK_TARGETS = int(os.environ.get("OSINT_MAX_BULK_TARGETS", 1000))
+MAX_BULK_PHONES = int(os.environ.get("OSINT_MAX_BULK_PHONES", 100000))
+# CSV columns tried, in order, for /bulk_phone uploads (else the first column)
+PHONE_COLUMNS = ("phone", "phone_number", "number", "mobile", "msisdn")
+# Scan time budget when a request has no "deadline_ms" (0 = unbounded)
+DEFAULT_DEADLINE_MS = int(os.environ.get("OSINT_DEFAULT_DEADLINE_MS", 0))
+# Long stages stop this much (at most 20% of the budget) before the deadline
+# so their partial output still reaches the merge and scoring stages
+DEADLINE_MARGIN = float(os.environ.get("OSINT_DEADLINE_MARGIN", 1.0))
+# "quick_scan": probe only the top-N platforms by expected value, within a budget
+QUICK_SCAN_TOP_N = int(os.environ.get("OSINT_QUICK_SCAN_TOP_N", 15))
+QUICK_SCAN_BUDGET_MS = int(os.environ.get("OSINT_QUICK_SCAN_BUDGET_MS", 5000))
+# Recent scan results kept in memory per process; the case store stays the
+# source of truth, so a short TTL bounds staleness when another worker rescans
+RESULT_CACHE_SIZE = int(os.environ.get("OSINT_RESULT_CACHE_SIZE", 64))
+RESULT_CACHE_TTL = int(os.environ.get("OSINT_RESULT_CACHE_TTL", 300))
+# Memory only: full results are PII and must not land in the shared OSINT_CACHE_DIR
+recent_results = get_cache("results", maxsize=RESULT_CACHE_SIZE, hit_ttl=RESULT_CACHE_TTL, miss_ttl=0,
+                           disk_dir=False, is_miss=lambda v: not v)
 
 def get_day_index(date_str):
     """Parses a date string and returns the day of week index (0=Mon, 6=Sun)."""
@@ -77,103 +118,145 @@ def home():
 
 @app.route("/create_case", methods=["POST"])
 def create_new_case():
-    global current_case_id
     data = request.json or {}
-    current_case_id = create_case(
+    case_id = create_case(
         case_name=data.get("case_name", "OSINT Investigation"),
         analyst=data.get("analyst", "Analyst"),
         scope=data.get("scope", {"username": True, "email": True, "phone": True})
     )
-    return jsonify({"status": "case_created", "case_id": current_case_id})
+    return jsonify({"status": "case_created", "case_id": case_id})
 
-@app.route("/check_status/<case_id>")
-def check_status(case_id):
-    path = os.path.join("cases", f"case_{case_id}", "investigation.json")
-    if os.path.exists(path):
-        return jsonify({"status": "COMPLETED"})
-    return jsonify({"status": "PROCESSING"})
+@app.route("/process")
+def process_page():
+    return render_template("process.html")
 
-@app.route("/run_osint", methods=["POST"])
-def run_osint():
-    global latest_result, current_case_id
-    data = request.json or {}
-    print("\n[>] Incoming Scan Request...")
-
-    if not current_case_id:
-        current_case_id = create_case("Auto-Scan Case", "System", {})
+def find_job(job_id):
+    return jobs.get(job_id) or stream_jobs.get(job_id) or bulk_jobs.get(job_id)
 
-    username = data.get("username")
-    email = data.get("email")
-    phone = data.get("phone")
+@app.route("/check_status/<case_id>")
+def check_status(case_id):
+    job = jobs.get_by_case(case_id) or stream_jobs.get_by_case(case_id) or bulk_jobs.get_by_case(case_id)
+    if job:
+        return jsonify(job.snapshot())
+
+    # No job in this process: fall back to the case store, first to the job
+    # snapshot another worker saved. create_case pre-creates
+    # investigation.json as [], so only real results count.
+    saved = load_case_file(case_id, "job.json")
+    if isinstance(saved, dict):
+        return jsonify(saved)
+    investigation = load_case_file(case_id, "investigation.json")
+    if investigation:
+        return jsonify({"status": "COMPLETED", "case_id": case_id, "progress": 100})
+    if get_case(case_id) is None:
+        return jsonify({"status": "UNKNOWN", "case_id": case_id}), 404
+    return jsonify({"status": "PROCESSING", "case_id": case_id})
 
-    # --- 1. USERNAME INTELLIGENCE ---
-    username_data = {}
-    radar_stats = {"Social": 0, "Dev": 0, "Geo": 0, "Breach": 0, "Contact": 0}
-    alts_generated = []
-    
-    if username:
+# ===============================
+# SCAN PIPELINE STAGES
+# ===============================
+def _stage_username(username, job=None, deadline=None, top_n=None, prior=None):
+    def run(results):
         print(f"[*] Scanning Username: {username}")
-        try:
-            raw_results = check_username(username)
-            print(f"[+] Scan finished. Found {len(raw_results)} profiles.")
-            radar_stats = raw_results.pop("_radar_stats", radar_stats)
-            alts_generated = raw_results.pop("_alts_generated", [])
-            username_data = raw_results
-        except Exception as e:
-            print(f"[!] Error in Username Scan: {e}")
-
-    # --- 2. EMAIL & ADVANCED INTELLIGENCE ---
-    email_data = {}
-    google_data = {}
-    account_enum_data = {}
-    advanced_search_data = {}
-
-    if email:
-        print(f"[*] Scanning Email: {email}")
-        email_data = email_osint(email)
-        
-        if "gmail.com" in email:
-            try:
-                google_data = google_osint(email)
-                email_data["google_intel"] = google_data
-                if google_data.get("gaia_data", {}).get("found"):
-                    radar_stats["Geo"] += 20
-            except: pass
-
-        try:
-            account_enum_data = run_account_enum(email)
-            email_data["account_enum"] = account_enum_data
-        except: pass
-
-        try:
-            advanced_search_data = run_advanced_search(email)
-            email_data["advanced"] = advanced_search_data
-        except: pass
-
-        try:
-            username_part = email.split("@")[0]
-            breach_result = simple_breach_check(username_part)
-            if breach_result.get("status") == "danger":
-                email_data["breach_check"] = "COMPROMISED"
-                email_data["breaches"] = breach_result.get("breaches", [])
-                radar_stats["Breach"] = 100 
-            else:
-                email_data["breach_check"] = "SAFE"
-        except:
-            email_data["breach_check"] = "UNKNOWN"
-
-    # --- 3. PHONE INTELLIGENCE ---
-    phone_data = {}
-    if phone:
-        print(f"[*] Scanning Phone: {phone}")
-        phone_data = phone_lookup(phone)
-        if phone_data.get("valid"):
-            radar_stats["Contact"] += 50
-            if "spam_score" not in phone_data.get("identity", {}):
-                if "identity" not in phone_data: phone_data["identity"] = {}
-                phone_data["identity"]["spam_score"] = "Low (0/10)"
-
-    # --- 4. TIMELINE & ACTIVITY ANALYSIS (REAL) ---
+        if job:
+            raw_results = check_username(
+                username,
+                on_total=job.platform_total,
+                on_result=job.platform_done,
+                cancel_event=job.cancel_event,
+                deadline=deadline,
+                top_n=top_n,
+                prior=prior
+            )
+        else:
+            raw_results = check_username(username, deadline=deadline, top_n=top_n, prior=prior)
+        print(f"[+] Scan finished. Found {len(raw_results)} profiles.")
+        return raw_results
+    return run
+
+def _stage_google(email):
+    def run(results):
+        return google_osint(email)
+    return run
+
+def _stage_breach(email):
+    def run(results):
+        username_part = email.split("@")[0]
+        return simple_breach_check(username_part)
+    return run
+
+def _stage_email_intel(results):
+    """Merges the independent email lookups into the email_results block."""
+    email_data = results.get("email") or {}
+
+    if results.get("google") is not None:
+        email_data["google_intel"] = results["google"]
+    if results.get("account_enum") is not None:
+        email_data["account_enum"] = results["account_enum"]
+    if results.get("advanced") is not None:
+        email_data["advanced"] = results["advanced"]
+
+    breach_result = results.get("breach")
+    if breach_result is None:
+        email_data["breach_check"] = "UNKNOWN"
+    elif breach_result.get("status") == "danger":
+        email_data["breach_check"] = "COMPROMISED"
+        email_data["breaches"] = breach_result.get("breaches", [])
+    else:
+        email_data["breach_check"] = "SAFE"
+    return email_data
+
+def _stage_github_profile(username, prior=None):
+    def run(results):
+        username_data = results.get("username") or {}
+        github = username_data.get("GitHub", {})
+        # Incremental scans reuse the profile while the GitHub page is unchanged
+        if prior and (prior.get("profiles") or {}).get("GitHub") and (
+                "GitHub" in username_data.get("_reused", ()) or github.get("not_modified")):
+            return {"GitHub": prior["profiles"]["GitHub"]}
+        if github.get("found"):
+            return {"GitHub": extract_github_profile(username)}
+        return {}
+    return run
+
+def _log_platform_evidence(case_id, username_data):
+    """One batched append for every found profile; URLs already logged are skipped."""
+    add_evidence_many(case_id, [{
+        "platform": platform,
+        "url": pdata["url"],
+        "type": "profile",
+        "confidence": "HIGH",
+        "notes": f"Detected via {pdata.get('category')} scan",
+        "analyst": "System",
+        "images": [pdata.get("avatar")] if pdata.get("avatar") else []
+    } for platform, pdata in username_data.items()
+        if isinstance(pdata, dict) and pdata.get("found") and pdata.get("url")])
+
+def _stage_evidence(case_id):
+    def run(results):
+        _log_platform_evidence(case_id, results.get("username") or {})
+    return run
+
+def _stage_wayback(case_id, deadline=None):
+    """Deferred, low-priority archive lookups for Social platforms that missed."""
+    def run(results):
+        candidates = (results.get("username") or {}).get("_wayback_candidates", [])
+        archived = check_wayback_batch(candidates, deadline)
+        _log_platform_evidence(case_id, archived)
+        return archived
+    return run
+
+def _merged_username_data(results):
+    """Primary platform hits plus archived profiles, without the internal _ keys."""
+    username_data = {k: v for k, v in (results.get("username") or {}).items() if not k.startswith("_")}
+    for platform, archived in (results.get("wayback") or {}).items():
+        username_data.setdefault(platform, archived)
+    return username_data
+
+def _stage_timeline(results):
+    """Timeline & activity analysis (real dates only)."""
+    username_data = results.get("username") or {}
+    email_data = results.get("email_intel") or {}
     timeline_events = []
     activity_stats = [0, 0, 0, 0, 0, 0, 0]
 
@@ -206,25 +289,26 @@ def run_osint():
         })
 
     timeline_events.sort(key=lambda x: str(x['year']))
+    return {"timeline": timeline_events, "activity_stats": activity_stats}
+
+def _stage_scoring(results):
+    username_data = _merged_username_data(results)
+    email_data = results.get("email_intel") or {}
+    phone_data = results.get("phone") or {}
+    profile_data = results.get("github_profile") or {}
+
+    radar_stats = (results.get("username") or {}).get(
+        "_radar_stats", {"Social": 0, "Dev": 0, "Geo": 0, "Breach": 0, "Contact": 0})
+    if (results.get("google") or {}).get("gaia_data", {}).get("found"):
+        radar_stats["Geo"] += 20
+    if email_data.get("breach_check") == "COMPROMISED":
+        radar_stats["Breach"] = 100
+    if phone_data.get("valid"):
+        radar_stats["Contact"] += 50
+        if "spam_score" not in phone_data.get("identity", {}):
+            if "identity" not in phone_data: phone_data["identity"] = {}
+            phone_data["identity"]["spam_score"] = "Low (0/10)"
 
-    # --- 5. PROFILE & EVIDENCE ---
-    profile_data = {}
-    if username_data.get("GitHub", {}).get("found"):
-        profile_data["GitHub"] = extract_github_profile(username)
-
-    for platform, pdata in username_data.items():
-        if pdata.get("found") and pdata.get("url"):
-            add_evidence(current_case_id, {
-                "platform": platform,
-                "url": pdata["url"],
-                "type": "profile",
-                "confidence": "HIGH",
-                "notes": f"Detected via {pdata.get('category')} scan",
-                "analyst": "System",
-                "images": [pdata.get("avatar")] if pdata.get("avatar") else []
-            })
-
-    # --- 6. SCORING ---
     correlation = correlate(username_data, phone_data, False)
     risk = calculate_risk(correlation)
     if radar_stats["Breach"] > 0:
@@ -234,58 +318,545 @@ def run_osint():
     confidence = calculate_identity_confidence(
         username_data, email_data, phone_data, profile_data
     )
-
-    latest_result = {
-        "case_id": current_case_id,
+    return {"risk": risk, "identity_confidence": confidence, "radar_stats": radar_stats}
+
+def build_osint_pipeline(case_id, username, email, phone, job=None, deadline=None, top_n=None, prior=None):
+    """
+    Declares the scan as a stage graph. Every lookup that only needs the raw
+    inputs runs concurrently; merge, evidence and scoring stages wait on the
+    stages they read from. A background job receives stage events and can
+    cancel the remaining stages. deadline (time.monotonic()) bounds the run;
+    top_n limits the username stage to the N highest-yield platforms; prior
+    (the case's last investigation) makes it an incremental re-scan.
+    """
+    stage_deadline = None
+    if deadline is not None:
+        stage_deadline = deadline - min(DEADLINE_MARGIN, max(0, deadline - time.monotonic()) * 0.2)
+
+    stages = [
+        Stage("username", _stage_username(username, job, stage_deadline, top_n, prior), enabled=bool(username)),
+        Stage("email", lambda r: email_osint(email), enabled=bool(email)),
+        Stage("google", _stage_google(email), enabled=bool(email) and "gmail.com" in email),
+        Stage("account_enum", lambda r: run_account_enum(email), enabled=bool(email)),
+        Stage("advanced", lambda r: run_advanced_search(email), enabled=bool(email)),
+        Stage("breach", _stage_breach(email), enabled=bool(email)),
+        Stage("phone", lambda r: phone_lookup(phone), enabled=bool(phone)),
+        Stage("email_intel", _stage_email_intel,
+              deps=("email", "google", "account_enum", "advanced", "breach"), enabled=bool(email)),
+        Stage("github_profile", _stage_github_profile(username, prior), deps=("username",), enabled=bool(username)),
+        Stage("evidence", _stage_evidence(case_id), deps=("username",), enabled=bool(username)),
+        Stage("wayback", _stage_wayback(case_id, stage_deadline), deps=("username",), enabled=bool(username)),
+        Stage("timeline", _stage_timeline, deps=("username", "email_intel"), after_deadline=True),
+        Stage("scoring", _stage_scoring, deps=("username", "wayback", "email_intel", "phone", "github_profile"),
+              after_deadline=True),
+    ]
+    if job is None:
+        return Pipeline(stages, deadline=deadline)
+    return Pipeline(stages, on_event=job.stage_event, cancel_event=job.cancel_event, deadline=deadline)
+
+def parse_bool(value):
+    """Flags from JSON or form/CSV fields; strings like "false", "0" or "" are False."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+def scan_deadline_ms(data):
+    """
+    The request's "deadline_ms" budget (or the default), None when unbounded.
+    Quick scans are never allowed more than QUICK_SCAN_BUDGET_MS.
+    """
+    try:
+        deadline_ms = int(data.get("deadline_ms") or DEFAULT_DEADLINE_MS)
+    except (TypeError, ValueError):
+        deadline_ms = DEFAULT_DEADLINE_MS
+    if parse_bool(data.get("quick_scan")):
+        deadline_ms = min(deadline_ms, QUICK_SCAN_BUDGET_MS) if deadline_ms > 0 else QUICK_SCAN_BUDGET_MS
+    return deadline_ms if deadline_ms > 0 else None
+
+def scan_top_n(data):
+    """Platform limit for a quick scan ("quick_scan", optional "top_n"), None for a full scan."""
+    if not parse_bool(data.get("quick_scan")):
+        return None
+    try:
+        return max(1, int(data.get("top_n") or QUICK_SCAN_TOP_N))
+    except (TypeError, ValueError):
+        return QUICK_SCAN_TOP_N
+
+def incremental_base(case_id, data):
+    """
+    The case's last investigation when the request asks for an "incremental"
+    re-scan of the same username, else None (a full scan runs instead).
+    """
+    if not data.get("incremental") or not data.get("username"):
+        return None
+    prior = get_case_result(case_id)
+    if not prior or not prior.get("username_results"):
+        print(f"[!] No earlier investigation for case {case_id}, running a full scan")
+        return None
+    previous = (prior.get("target") or {}).get("username") or ""
+    if previous.strip().lstrip("@").lower() != data["username"].strip().lstrip("@").lower():
+        print(f"[!] Case {case_id} last scanned '{previous}', running a full scan")
+        return None
+    return prior
+
+def execute_scan(case_id, data, job=None):
+    """
+    Runs the full pipeline for one request body and persists investigation.json.
+    With a deadline the result holds whatever finished in time, and stages cut
+    off are listed in timed_out_stages.
+    """
+    username = data.get("username")
+    email = data.get("email")
+    phone = data.get("phone")
+    deadline_ms = scan_deadline_ms(data)
+    deadline = None if deadline_ms is None else time.monotonic() + deadline_ms / 1000
+    top_n = scan_top_n(data)
+    prior = incremental_base(case_id, data)
+
+    pipeline = build_osint_pipeline(case_id, username, email, phone, job, deadline, top_n, prior)
+    results = pipeline.run()
+
+    raw_results = results.get("username") or {}
+    alts_generated = raw_results.get("_alts_generated", [])
+    username_data = _merged_username_data(results)
+    timeline = results.get("timeline") or {"timeline": [], "activity_stats": [0, 0, 0, 0, 0, 0, 0]}
+    scoring = results.get("scoring") or {}
+
+    result = {
+        "case_id": case_id,
         "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": {"username": username, "email": email, "phone": phone},
         "username_results": username_data,
-        "email_results": email_data,
-        "phone_results": phone_data,
-        "profiles": profile_data,
-        "risk": risk,
-        "identity_confidence": confidence,
-        "radar_stats": radar_stats,
-        "timeline": timeline_events,
-        "activity_stats": activity_stats,
-        "alts": alts_generated
+        "email_results": results.get("email_intel") or {},
+        "phone_results": results.get("phone") or {},
+        "profiles": results.get("github_profile") or {},
+        "risk": scoring.get("risk", {}),
+        "identity_confidence": scoring.get("identity_confidence", {}),
+        "radar_stats": scoring.get("radar_stats", {}),
+        "timeline": timeline["timeline"],
+        "activity_stats": timeline["activity_stats"],
+        "alts": alts_generated,
+        "stage_timings": pipeline.timings,
+        "fetch_stats": raw_results.get("_fetch_stats", {}),
+        "probe_status": raw_results.get("_probe_status", {}),
+        "deadline_ms": deadline_ms,
+        "scan_mode": "incremental" if prior else "quick" if top_n else "full",
+        "probed_platforms": raw_results.get("_probed"),
+        "platform_checked_at": raw_results.get("_checked_at", {}),
+        "stage_status": pipeline.states,
+        "timed_out_stages": pipeline.timed_out,
+        "partial": bool(pipeline.timed_out) or any(
+            s.get("state") in ("timed_out", "cancelled") for s in raw_results.get("_probe_status", {}).values())
     }
+    if prior:
+        result["diff"] = {
+            "since": prior.get("timestamp"),
+            "reprobed": len(raw_results.get("_probed") or []),
+            "reused": len(raw_results.get("_reused") or []),
+            "not_modified": sum(1 for name in raw_results.get("_probed") or []
+                                if (username_data.get(name) or {}).get("not_modified")),
+            **rescan.diff(prior.get("username_results"), username_data, raw_results.get("_probe_status", {}))
+        }
+
+    update_case(case_id, result, "investigation.json")
+    recent_results.set(case_id, result)
+    return result
+
+def get_case_result(case_id):
+    """Latest scan result for case_id: recent in-memory copy, else the case store."""
+    result = recent_results.get(case_id)
+    if result is MISSING:
+        # create_case pre-creates investigation.json as [] until a scan lands
+        result = load_case_file(case_id, "investigation.json") or None
+        if result:
+            recent_results.set(case_id, result)
+    return result
+
+def unknown_case(case_id):
+    """404 response when a client-supplied case_id does not exist, else None."""
+    if get_case(case_id) is None:
+        return jsonify({"error": "Unknown case", "case_id": case_id}), 404
+    return None
 
-    update_case(current_case_id, latest_result, "investigation.json")
+@app.route("/run_osint", methods=["POST"])
+def run_osint():
+    data = request.json or {}
+    print("\n[>] Incoming Scan Request...")
+
+    # Case context comes with the request; without one each scan gets its own case
+    missing = data.get("case_id") and unknown_case(data["case_id"])
+    if missing:
+        return missing
+    case_id = data.get("case_id") or create_case("Auto-Scan Case", "System", {})
+
+    result = execute_scan(case_id, data)
     print(f"[>] Scan complete. Sent data to frontend.\n")
 
-    # ✅ ONLY FIXED LINE
-    return jsonify({"success": True, "data": latest_result}), 200
+    return jsonify({"success": True, "data": result}), 200
+
+def start_scan_job(data, manager=jobs):
+    """Creates (or reuses) the case for a request body and queues its scan on manager."""
+    case_id = data.get("case_id") or create_case(
+        case_name=data.get("case_name", "OSINT Investigation"),
+        analyst=data.get("analyst", "Analyst"),
+        scope={k: bool(data.get(k)) for k in ("username", "email", "phone")}
+    )
+    job = manager.submit(case_id, lambda j: execute_scan(case_id, data, j))
+    print(f"[>] Queued background scan {job.job_id} for case {case_id}")
+    return job
+
+def _event_stream(job, sse, start=0):
+    for evt in job.iter_events(start):
+        if evt is None:
+            # Keep-alive so proxies don't drop a quiet stream
+            yield ": keepalive\n\n" if sse else "\n"
+            continue
+        payload = json.dumps(evt, default=str)
+        if sse:
+            yield f"id: {evt['seq']}\nevent: {evt['event']}\ndata: {payload}\n\n"
+        else:
+            yield payload + "\n"
+
+def stream_job(job, sse, start=0):
+    return Response(
+        stream_with_context(_event_stream(job, sse, start)),
+        mimetype="text/event-stream" if sse else "application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Job-Id": job.job_id,
+            "X-Case-Id": job.case_id
+        }
+    )
+
+@app.route("/submit_scan", methods=["POST"])
+def submit_scan():
+    """Starts a scan as a background job and returns its ids immediately."""
+    data = request.json or {}
+    missing = data.get("case_id") and unknown_case(data["case_id"])
+    if missing:
+        return missing
+    job = start_scan_job(data)
+    return jsonify({"status": "queued", "job_id": job.job_id, "case_id": job.case_id}), 202
+
+@app.route("/stream_osint", methods=["POST"])
+def stream_osint():
+    """
+    Starts a scan and streams platform hits, stage results and the final
+    result as they happen. NDJSON by default, SSE when the client accepts
+    text/event-stream.
+    """
+    data = request.json or {}
+    missing = data.get("case_id") and unknown_case(data["case_id"])
+    if missing:
+        return missing
+    job = start_scan_job(data, stream_jobs)
+    sse = "text/event-stream" in request.headers.get("Accept", "")
+    return stream_job(job, sse)
+
+@app.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    """SSE feed for an existing job; EventSource resumes via Last-Event-ID."""
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    last_id = request.headers.get("Last-Event-ID", "")
+    start = int(last_id) + 1 if last_id.isdigit() else 0
+    return stream_job(job, True, start)
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.snapshot())
+
+@app.route("/jobs/<job_id>/cancel", methods=["POST"])
+def cancel_job(job_id):
+    job = jobs.cancel(job_id) or stream_jobs.cancel(job_id) or bulk_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.snapshot())
+
+def parse_bulk_targets():
+    """
+    Targets from a JSON body ({"targets": [{username, email, phone}, ...]})
+    or an uploaded CSV file with username/email/phone columns.
+    Identical targets are collapsed. Returns (targets, options).
+    """
+    if "file" in request.files:
+        text = request.files["file"].read().decode("utf-8-sig", errors="replace")
+        rows = [{(k or "").strip().lower(): v for k, v in row.items()}
+                for row in csv.DictReader(io.StringIO(text))]
+        options = request.form
+    else:
+        options = request.json or {}
+        rows = options.get("targets") or []
+
+    targets = []
+    seen = set()
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        target = {k: (str(row.get(k) or "").strip() or None) for k in ("username", "email", "phone")}
+        key = tuple(target.values())
+        if not any(key) or key in seen:
+            continue
+        seen.add(key)
+        targets.append(target)
+    return targets, options
+
+@app.route("/bulk_scan", methods=["POST"])
+def bulk_scan():
+    """
+    Scans many targets through the shared bulk pool, one case per target.
+    Shared sub-lookups (same username probes, GitHub user, email domain MX)
+    are deduplicated by the single-flight result caches underneath.
+    """
+    targets, options = parse_bulk_targets()
+    if not targets:
+        return jsonify({"error": "No targets supplied"}), 400
+    if len(targets) > MAX_BULK_TARGETS:
+        return jsonify({"error": f"Too many targets (max {MAX_BULK_TARGETS})"}), 400
+
+    case_prefix = options.get("case_name", "Bulk Scan")
+    analyst = options.get("analyst", "Analyst")
+    scan_options = {"deadline_ms": options.get("deadline_ms"), "quick_scan": parse_bool(options.get("quick_scan"))}
+    batch_id = bulk_jobs.create_batch()
+    submitted = []
+    for target in targets:
+        label = target["username"] or target["email"] or target["phone"]
+        case_id = create_case(
+            case_name=f"{case_prefix}: {label}",
+            analyst=analyst,
+            scope={k: bool(v) for k, v in target.items()}
+        )
+        submitted.append(bulk_jobs.submit(
+            case_id, lambda j, c=case_id, t=dict(target, **scan_options): execute_scan(c, t, j),
+            target=target, batch_id=batch_id))
+
+    print(f"[>] Queued bulk batch {batch_id} with {len(submitted)} targets")
+    return jsonify({
+        "status": "queued",
+        "batch_id": batch_id,
+        "total": len(submitted),
+        "jobs": [{"job_id": j.job_id, "case_id": j.case_id, "target": j.target} for j in submitted]
+    }), 202
+
+def parse_bulk_phones():
+    """
+    Numbers from a JSON body ({"numbers": [...], "region": "IN"}) or an
+    uploaded CSV / one-per-line file. Returns (numbers, options).
+    """
+    if "file" in request.files:
+        text = request.files["file"].read().decode("utf-8-sig", errors="replace")
+        rows = [row for row in csv.reader(io.StringIO(text)) if row]
+        column = 0
+        # A first row without digits is a header naming the columns
+        if rows and not any(ch.isdigit() for ch in "".join(rows[0])):
+            header = [h.strip().lower() for h in rows.pop(0)]
+            column = next((header.index(c) for c in PHONE_COLUMNS if c in header), 0)
+        numbers = [row[column].strip() for row in rows if len(row) > column and row[column].strip()]
+        options = request.form
+    else:
+        options = request.json or {}
+        numbers = [str(n).strip() for n in options.get("numbers") or [] if str(n).strip()]
+    return numbers, options
+
+@app.route("/bulk_phone", methods=["POST"])
+def bulk_phone():
+    """
+    Offline phone triage for many numbers at once (e.g. a leaked contact
+    list). Streams one NDJSON line per number in input order, then a final
+    {"summary": ...} line with counts and throughput.
+    """
+    numbers, options = parse_bulk_phones()
+    if not numbers:
+        return jsonify({"error": "No numbers supplied"}), 400
+    if len(numbers) > MAX_BULK_PHONES:
+        return jsonify({"error": f"Too many numbers (max {MAX_BULK_PHONES})"}), 400
+    region = options.get("region") or None
+    if region is not None and not (isinstance(region, str) and len(region) == 2 and region.isalpha()):
+        return jsonify({"error": "region must be a two-letter country code, e.g. \"IN\""}), 400
+    region = region and region.upper()
+
+    def generate():
+        stats = {}
+        for number, result in phone_lookup_many(numbers, region, stats):
+            yield json.dumps({"input": number, **result}) + "\n"
+        print(f"[+] Bulk phone triage: {stats['count']} numbers in {stats['seconds']}s "
+              f"({stats['numbers_per_sec']}/s)")
+        yield json.dumps({"summary": {**stats, "prefix_cache": cache_stats().get("phone_prefix")}}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route("/bulk_scan/<batch_id>")
+def bulk_status(batch_id):
+    snapshot = bulk_jobs.batch_snapshot(batch_id)
+    if snapshot is None:
+        return jsonify({"error": "Unknown batch"}), 404
+    return jsonify(snapshot)
+
+@app.route("/bulk_scan/<batch_id>/cancel", methods=["POST"])
+def bulk_cancel(batch_id):
+    bulk_jobs.cancel_batch(batch_id)
+    snapshot = bulk_jobs.batch_snapshot(batch_id)
+    if snapshot is None:
+        return jsonify({"error": "Unknown batch"}), 404
+    return jsonify(snapshot)
+
+@app.route("/cases")
+def cases_route():
+    """Newest cases first, optionally filtered by ?analyst=, ?status= and ?platform= (a hit on it)."""
+    limit = min(max(1, request.args.get("limit", 50, type=int)), 500)
+    offset = max(0, request.args.get("offset", 0, type=int))
+    return jsonify(list_cases(request.args.get("analyst"), request.args.get("status"), limit, offset,
+                              request.args.get("platform")))
+
+@app.route("/lookup")
+def lookup_route():
+    """
+    Earlier cases where an identifier appeared: ?q=<value>[&kind=username|
+    email|phone|url|avatar]. The kind is guessed from q when omitted.
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Missing q"}), 400
+    start = time.perf_counter()
+    try:
+        result = find_cases(query, request.args.get("kind"), min(request.args.get("limit", 200, type=int), 1000))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result["query"] = query
+    result["took_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return jsonify(result)
 
 @app.route("/add_evidence", methods=["POST"])
 def manual_evidence():
     data = request.json or {}
-    entry = add_evidence(current_case_id, data)
+    case_id = data.get("case_id")
+    if not case_id:
+        return jsonify({"error": "Missing case_id"}), 400
+    missing = unknown_case(case_id)
+    if missing:
+        return missing
+    entry = add_evidence(case_id, data)
+    if entry is None:
+        return jsonify({"status": "duplicate", "url": data.get("url")})
     return jsonify({"status": "evidence_added", "evidence": entry})
 
 @app.route("/get_result")
 def get_result():
-    return jsonify({"success": True, "data": latest_result}), 200
+    """Legacy envelope form: /get_result?case_id=..."""
+    case_id = request.args.get("case_id")
+    if not case_id:
+        return jsonify({"error": "Missing case_id"}), 400
+    result = get_case_result(case_id)
+    if result is None:
+        return jsonify({"success": False, "error": "No result for case"}), 404
+    return jsonify({"success": True, "data": result}), 200
+
+@app.route("/get_result/<case_id>")
+def get_result_by_case(case_id):
+    """The case's latest scan result, as the dashboard consumes it."""
+    result = get_case_result(case_id)
+    if result is None:
+        return jsonify({"error": "No result for case", "case_id": case_id}), 404
+    return jsonify(result)
 
 @app.route("/get_evidence/<case_id>")
 def get_evidence_route(case_id):
-    path = os.path.join("cases", f"case_{case_id}", "evidence.json")
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return jsonify(json.load(f))
-    return jsonify([])
+    """
+    Streams a page of the case's evidence (?offset=0&limit=N) as a JSON
+    array, or NDJSON when the client accepts it. X-Next-Offset is set when
+    more entries follow.
+    """
+    offset = max(0, request.args.get("offset", 0, type=int))
+    limit = request.args.get("limit", type=int)
+    if limit is not None:
+        limit = max(0, limit)
+    ndjson = "application/x-ndjson" in request.headers.get("Accept", "")
+
+    entries = itertools.islice(iter_evidence(case_id), offset, None)
+    page = entries if limit is None else itertools.islice(entries, limit + 1)
+    headers = {}
+    if limit is not None:
+        # Peek one past the page to tell whether there is a next one
+        page = list(page)
+        if len(page) > limit:
+            page = page[:limit]
+            headers["X-Next-Offset"] = str(offset + limit)
+
+    def generate():
+        first = True
+        if not ndjson:
+            yield "["
+        for entry in page:
+            line = json.dumps(entry, default=str)
+            if ndjson:
+                yield line + "\n"
+            else:
+                yield line if first else "," + line
+            first = False
+        if not ndjson:
+            yield "]"
+
+    mimetype = "application/x-ndjson" if ndjson else "application/json"
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers=headers)
+
+@app.route("/http_stats")
+def http_stats():
+    stats = get_pool_stats()
+    stats["rate_limits"] = host_guard.stats()
+    # Only once a scan has loaded it; reporting must not import dnspython
+    mail_domain = sys.modules.get("osint_modules.mail_domain")
+    if mail_domain is not None:
+        stats["mail"] = mail_domain.stats()
+    return jsonify(stats)
+
+@app.route("/cache_stats")
+def cache_stats_route():
+    return jsonify({**cache_stats(), "demographics": demographics.stats()})
+
+@app.route("/platforms")
+def platforms_route():
+    return jsonify({**registry.stats(), "platforms": [p.to_dict() for p in registry.platforms()]})
+
+@app.route("/platform_priority")
+def platform_priority_route():
+    """Current probe order with each platform's learned hit rate and latency."""
+    return jsonify(priority.stats(registry.platforms()))
 
 @app.route("/submit_analyst_notes", methods=["POST"])
 def submit_analyst_notes():
     data = request.json or {}
+    case_id = data.get("case_id")
+    if not case_id:
+        return jsonify({"error": "Missing case_id"}), 400
+    missing = unknown_case(case_id)
+    if missing:
+        return missing
     notes = {
         "verdict": data.get("verdict"),
         "notes": data.get("notes"),
         "analyst": data.get("analyst", "Analyst"),
         "submitted_at": datetime.now(timezone.utc).isoformat()
     }
-    save_analyst_notes(current_case_id, notes)
+    save_analyst_notes(case_id, notes)
     return jsonify({"status": "saved"})
 
+@app.route("/startup_report")
+def startup_report_route():
+    """Start-up time plus the import cost of each intelligence module loaded so far."""
+    return jsonify({"startup_seconds": STARTUP_SECONDS, **lazy_modules.report()})
+
+STARTUP_SECONDS = round(time.perf_counter() - _startup, 3)
+print(f"[+] App ready in {STARTUP_SECONDS * 1000:.0f} ms, "
+      f"{len(lazy_modules.pending())} intelligence modules deferred")
+if lazy_modules.WARMUP:
+    lazy_modules.warm_up()
+
 if __name__ == "__main__":
     print("[+] OSINT Command Center Online: http://127.0.0.1:5000")
     app.run(debug=True, port=5000)
@@ -0,0 +1,209 @@
+import os
+import glob
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from helpers import json_codec
+from helpers.evidence import new_entry, normalize_url, platform_hits
+
+# File implementation of the case_manager API (the default store): one
+# directory per case holding its JSON documents and an evidence log.
+BASE_DIR = "cases"
+# Evidence is an append-only JSON Lines log; evidence.json is the legacy format
+EVIDENCE_LOG = "evidence.jsonl"
+LEGACY_EVIDENCE = "evidence.json"
+# fsync once per add_evidence_many batch (set to 0 to leave it to the OS)
+EVIDENCE_FSYNC = os.environ.get("OSINT_EVIDENCE_FSYNC", "1") == "1"
+# Cases whose evidence URLs are kept in memory for dedupe; older ones are
+# re-read from their log on their next add_evidence_many
+EVIDENCE_CACHE_CASES = int(os.environ.get("OSINT_EVIDENCE_CACHE_CASES", 256))
+# Encoding for documents written through update_case: json (indented, the
+# original format), compact, gzip or zstd (see helpers/json_codec.py).
+# Readers accept all of them, so switching is safe in either direction.
+CASE_ENCODING = os.environ.get("OSINT_CASE_ENCODING", "json")
+# fsync each document before it is renamed into place
+CASE_FSYNC = os.environ.get("OSINT_CASE_FSYNC", "1") == "1"
+
+if CASE_ENCODING not in json_codec.ENCODINGS:
+    print(f"[!] Unknown OSINT_CASE_ENCODING '{CASE_ENCODING}', using json")
+    CASE_ENCODING = "json"
+elif CASE_ENCODING == "zstd" and json_codec.zstandard is None:
+    print("[!] zstandard missing, case documents will be gzip-compressed")
+
+# -----------------------------
+# CASE CREATION
+# -----------------------------
+def create_case(case_name, analyst, scope):
+    case_id = str(uuid.uuid4())
+    case_path = os.path.join(BASE_DIR, f"case_{case_id}")
+    os.makedirs(case_path, exist_ok=True)
+
+    metadata = {
+        "case_id": case_id,
+        "case_name": case_name,
+        "analyst": analyst,
+        "scope": scope,
+        "status": "OPEN",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+
+    json_codec.write_atomic(os.path.join(case_path, "metadata.json"), metadata, "json", CASE_FSYNC)
+
+    # Initialize empty files
+    for file in ["investigation.json", "analyst_notes.json"]:
+        json_codec.write_atomic(os.path.join(case_path, file), [], "compact", fsync=False)
+    open(os.path.join(case_path, EVIDENCE_LOG), "a").close()
+
+    return case_id
+
+# -----------------------------
+# UPDATE CASE FILE
+# -----------------------------
+def update_case(case_id, data, filename):
+    path = os.path.join(BASE_DIR, f"case_{case_id}", filename)
+    json_codec.write_atomic(path, data, CASE_ENCODING, CASE_FSYNC)
+
+# -----------------------------
+# ANALYST NOTES
+# -----------------------------
+def save_analyst_notes(case_id, notes):
+    path = os.path.join(BASE_DIR, f"case_{case_id}", "analyst_notes.json")
+    notes["updated_at"] = datetime.now(timezone.utc).isoformat()
+    json_codec.write_atomic(path, notes, "json", CASE_FSYNC)
+
+# -----------------------------
+# EVIDENCE LOGGING
+# -----------------------------
+# case_id -> {"lock", "urls", "users"}, least recently used first
+_evidence_cases = OrderedDict()
+_evidence_guard = threading.Lock()
+
+def _checkout_evidence(case_id):
+    """
+    The case's append lock and known URLs (None until loaded). Cases nobody
+    is writing to are dropped beyond EVIDENCE_CACHE_CASES, so a writer
+    never ends up with a different lock than another writer of its case.
+    """
+    with _evidence_guard:
+        state = _evidence_cases.get(case_id)
+        if state is None:
+            state = _evidence_cases[case_id] = {"lock": threading.Lock(), "urls": None, "users": 0}
+        _evidence_cases.move_to_end(case_id)
+        state["users"] += 1
+        excess = len(_evidence_cases) - EVIDENCE_CACHE_CASES
+        for old in [k for k, s in _evidence_cases.items() if not s["users"]][:max(0, excess)]:
+            del _evidence_cases[old]
+    return state
+
+def _checkin_evidence(state):
+    with _evidence_guard:
+        state["users"] -= 1
+
+def _read_evidence_raw(case_id):
+    """Legacy evidence.json entries, then every complete line of the JSONL log."""
+    case_path = os.path.join(BASE_DIR, f"case_{case_id}")
+    legacy = json_codec.read(os.path.join(case_path, LEGACY_EVIDENCE))
+    if isinstance(legacy, list):
+        yield from legacy
+    try:
+        with open(os.path.join(case_path, EVIDENCE_LOG), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn last line from a crash mid-append
+                    continue
+    except OSError:
+        return
+
+def iter_evidence(case_id):
+    """Yields a case's evidence in collection order, first entry per URL only."""
+    seen = set()
+    for entry in _read_evidence_raw(case_id):
+        key = normalize_url(entry.get("url"))
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        yield entry
+
+def _known_urls(case_id, state):
+    if state["urls"] is None:
+        state["urls"] = {normalize_url(e.get("url")) for e in _read_evidence_raw(case_id)}
+        state["urls"].discard(None)
+    return state["urls"]
+
+def add_evidence_many(case_id, items):
+    """
+    Appends every item whose URL the case has not logged yet, as one write
+    (and one fsync) to the case's evidence.jsonl. Returns the new entries.
+    """
+    path = os.path.join(BASE_DIR, f"case_{case_id}", EVIDENCE_LOG)
+    state = _checkout_evidence(case_id)
+    try:
+        with state["lock"]:
+            urls = _known_urls(case_id, state)
+            entries = []
+            for evidence in items:
+                key = normalize_url(evidence.get("url"))
+                if key:
+                    if key in urls:
+                        continue
+                    urls.add(key)
+                entries.append(new_entry(evidence))
+            if not entries:
+                return []
+
+            payload = "".join(json.dumps(e, default=str) + "\n" for e in entries).encode("utf-8")
+            with open(path, "a+b") as f:
+                # Start on a fresh line if a previous append was torn
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        payload = b"\n" + payload
+                f.write(payload)
+                f.flush()
+                if EVIDENCE_FSYNC:
+                    os.fsync(f.fileno())
+    finally:
+        _checkin_evidence(state)
+    return entries
+
+# -----------------------------
+# READING CASES
+# -----------------------------
+def load_case_file(case_id, filename, default=None):
+    path = os.path.join(BASE_DIR, f"case_{case_id}", filename)
+    return json_codec.read(path, default)
+
+def get_case(case_id):
+    return load_case_file(case_id, "metadata.json")
+
+def list_cases(analyst=None, status=None, limit=50, offset=0, platform=None):
+    """Newest first. Walks every case directory; the sqlite store uses indexes instead."""
+    cases = []
+    for path in glob.glob(os.path.join(BASE_DIR, "case_*", "metadata.json")):
+        case = json_codec.read(path)
+        if not isinstance(case, dict):
+            continue
+        if analyst and case.get("analyst") != analyst:
+            continue
+        if status and case.get("status") != status:
+            continue
+        if platform and platform not in {p for p, _, _ in platform_hits(
+                load_case_file(case.get("case_id"), "investigation.json"))}:
+            continue
+        cases.append(case)
+    cases.sort(key=lambda c: c.get("created_at") or "", reverse=True)
+    return cases[offset:offset + limit]
+
+def iter_investigations():
+    """Every non-empty investigation.json in the archive."""
+    for path in glob.glob(os.path.join(BASE_DIR, "case_*", "investigation.json")):
+        data = json_codec.read(path)
+        if data:
+            yield data
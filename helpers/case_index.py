@@ -0,0 +1,227 @@
+import os
+import re
+import time
+
+from helpers import case_store
+
+# phonenumbers is imported on the first phone lookup (it is slow to import)
+phonenumbers = None
+
+# Cross-case inverted index: normalized identifier -> case ids. It lives in
+# the case store database when OSINT_CASE_STORE=sqlite, otherwise in its own
+# SQLite file next to the case directories.
+INDEX_DB = os.environ.get("OSINT_INDEX_DB") or (
+    case_store.DB_PATH if os.environ.get("OSINT_CASE_STORE", "files") == "sqlite"
+    else os.path.join("cases", "index.db"))
+
+KINDS = ("username", "email", "phone", "url", "avatar")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS identifiers (
+    kind     TEXT NOT NULL,
+    value    TEXT NOT NULL,
+    case_id  TEXT NOT NULL,
+    source   TEXT NOT NULL,
+    PRIMARY KEY (kind, value, case_id, source)
+);
+CREATE INDEX IF NOT EXISTS idx_identifiers_case ON identifiers(case_id, source);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+"""
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+
+def _connect():
+    return case_store.connect(INDEX_DB, SCHEMA)
+
+
+# -----------------------------
+# NORMALIZATION
+# -----------------------------
+def normalize(kind, value):
+    """Canonical form used as the index key, or None if value is unusable."""
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    if kind == "username":
+        return value.lstrip("@").lower() or None
+    if kind == "email":
+        value = value.lower()
+        return value if _EMAIL_RE.fullmatch(value) else None
+    if kind == "phone":
+        if _phonenumbers() is not None:
+            try:
+                parsed = phonenumbers.parse(value, None)
+                if phonenumbers.is_valid_number(parsed):
+                    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+            except phonenumbers.NumberParseException:
+                pass
+        digits = re.sub(r"\D", "", value)
+        return "+" + digits if len(digits) >= 7 else None
+    if kind in ("url", "avatar"):
+        # Scheme, "www." and trailing slashes don't make a different profile
+        value = re.sub(r"^[a-z][a-z0-9+.-]*://", "", value, flags=re.I)
+        host, _, rest = value.partition("/")
+        host = host.lower()
+        if host.startswith("www."):
+            host = host[4:]
+        return (host + ("/" + rest.split("#")[0] if rest else "")).rstrip("/") or None
+    return None
+
+
+def _phonenumbers():
+    global phonenumbers
+    if phonenumbers is None:
+        try:
+            import phonenumbers as module
+        except ImportError:
+            module = False
+        phonenumbers = module
+    return phonenumbers or None
+
+
+def guess_kind(value):
+    value = (value or "").strip()
+    if "@" in value.lstrip("@"):
+        return "email"
+    if "/" in value or value.lower().startswith("http"):
+        return "url"
+    if re.fullmatch(r"\+?[\d\s().-]{7,}", value):
+        return "phone"
+    return "username"
+
+
+# -----------------------------
+# EXTRACTION
+# -----------------------------
+def identifiers_from_investigation(data):
+    """(kind, raw value) pairs worth indexing from one scan result."""
+    if not isinstance(data, dict):
+        return
+    target = data.get("target") or {}
+    yield "username", target.get("username")
+    yield "email", target.get("email")
+    yield "phone", target.get("phone")
+    yield "phone", ((data.get("phone_results") or {}).get("basic") or {}).get("format_e164")
+
+    for r in (data.get("username_results") or {}).values():
+        if not isinstance(r, dict) or not r.get("found"):
+            continue
+        meta = r.get("metadata") or {}
+        yield "url", r.get("url")
+        yield "avatar", r.get("avatar") or meta.get("image")
+        for secret in meta.get("secrets") or []:
+            for email in _EMAIL_RE.findall(str(secret)):
+                yield "email", email
+
+    for profile in (data.get("profiles") or {}).values():
+        if isinstance(profile, dict):
+            yield "avatar", profile.get("avatar") or profile.get("avatar_url")
+            yield "email", profile.get("email")
+
+
+def identifiers_from_evidence(entries):
+    for e in entries:
+        yield "url", e.get("url")
+        for image in e.get("images") or []:
+            yield "avatar", image
+
+
+def _rows(case_id, source, pairs):
+    rows = set()
+    for kind, raw in pairs:
+        value = normalize(kind, raw)
+        if value:
+            rows.add((kind, value, case_id, source))
+    return rows
+
+
+# -----------------------------
+# MAINTENANCE
+# -----------------------------
+def index_investigation(case_id, data):
+    """Replaces the case's investigation postings with those from data."""
+    conn = _connect()
+    rows = _rows(case_id, "investigation", identifiers_from_investigation(data))
+    with conn:
+        conn.execute("DELETE FROM identifiers WHERE case_id = ? AND source = 'investigation'", (case_id,))
+        conn.executemany("INSERT OR IGNORE INTO identifiers VALUES (?, ?, ?, ?)", rows)
+
+
+def index_evidence(case_id, entries):
+    """Adds postings for newly logged evidence (evidence is append-only)."""
+    rows = _rows(case_id, "evidence", identifiers_from_evidence(entries))
+    if rows:
+        conn = _connect()
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO identifiers VALUES (?, ?, ?, ?)", rows)
+
+
+def rebuild(iter_investigations, iter_evidence):
+    """Re-indexes the whole archive from the case store readers."""
+    conn = _connect()
+    start = time.perf_counter()
+    cases = 0
+    with conn:
+        conn.execute("DELETE FROM identifiers")
+    for data in iter_investigations():
+        case_id = data.get("case_id") if isinstance(data, dict) else None
+        if not case_id:
+            continue
+        index_investigation(case_id, data)
+        index_evidence(case_id, list(iter_evidence(case_id)))
+        cases += 1
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO index_meta VALUES ('built_at', ?)", (str(time.time()),))
+    print(f"[+] Case index rebuilt: {cases} cases in {time.perf_counter() - start:.2f}s")
+    return cases
+
+
+def invalidate():
+    """Forces a rebuild on next lookup (after bulk writes that bypassed the index)."""
+    conn = _connect()
+    with conn:
+        conn.execute("DELETE FROM index_meta WHERE key = 'built_at'")
+
+
+def is_built():
+    return _connect().execute("SELECT 1 FROM index_meta WHERE key = 'built_at'").fetchone() is not None
+
+
+# -----------------------------
+# QUERY
+# -----------------------------
+def lookup(query, kind=None, limit=200, overlay=None):
+    """
+    Cases where query has appeared, with the kinds/sources it was seen as.
+    overlay ({case_id: investigation}) holds investigations not indexed yet;
+    they replace whatever the index has for those cases.
+    """
+    kind = kind or guess_kind(query)
+    if kind not in KINDS:
+        raise ValueError(f"unknown kind '{kind}'")
+    value = normalize(kind, query)
+    if not value:
+        return {"kind": kind, "value": None, "cases": []}
+
+    kinds = ("url", "avatar") if kind in ("url", "avatar") else (kind,)
+    placeholders = ",".join("?" * len(kinds))
+    rows = [dict(r) for r in _connect().execute(
+        f"SELECT case_id, kind, source FROM identifiers WHERE kind IN ({placeholders}) AND value = ? LIMIT ?",
+        (*kinds, value, limit))]
+    if overlay:
+        rows = [r for r in rows if not (r["source"] == "investigation" and r["case_id"] in overlay)]
+        for case_id, data in overlay.items():
+            rows.extend({"case_id": case_id, "kind": k, "source": source}
+                        for k, v, _, source in _rows(case_id, "investigation", identifiers_from_investigation(data))
+                        if k in kinds and v == value)
+        rows = rows[:limit]
+
+    cases = {}
+    for r in rows:
+        hit = cases.setdefault(r["case_id"], {"case_id": r["case_id"], "seen_as": []})
+        hit["seen_as"].append(f"{r['kind']}:{r['source']}")
+    return {"kind": kind, "value": value, "cases": list(cases.values())}
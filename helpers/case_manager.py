@@ -1,85 +1,254 @@
 import os
-import json
-import uuid
-from datetime import datetime, timezone
+import atexit
+import sqlite3
+import threading
+import time
 
-BASE_DIR = "cases"
+from helpers import case_files, case_index, case_store
+
+# "files" (one directory per case, helpers/case_files.py) or "sqlite" (helpers/case_store.py)
+CASE_STORE = os.environ.get("OSINT_CASE_STORE", "files")
+# Queue update_case writes for a background writer instead of blocking the caller
+WRITE_BEHIND = os.environ.get("OSINT_WRITE_BEHIND", "1") == "1"
+# How long exit / flush() waits for queued writes
+FLUSH_TIMEOUT = float(os.environ.get("OSINT_FLUSH_TIMEOUT", 30))
+
+# The case_manager API is served by one store object built at import:
+#
+#   WriteBehindStore -> IndexedStore -> backend (case_files or case_store)
+#
+# A backend is a module implementing the API's functions. Each layer wraps
+# the store below it and overrides only the calls it changes; everything
+# else passes straight through StoreLayer.
 
 # -----------------------------
-# CASE CREATION
+# STORE LAYERS
 # -----------------------------
-def create_case(case_name, analyst, scope):
-    case_id = str(uuid.uuid4())
-    case_path = os.path.join(BASE_DIR, f"case_{case_id}")
-    os.makedirs(case_path, exist_ok=True)
-
-    metadata = {
-        "case_id": case_id,
-        "case_name": case_name,
-        "analyst": analyst,
-        "scope": scope,
-        "status": "OPEN",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-
-    with open(os.path.join(case_path, "metadata.json"), "w") as f:
-        json.dump(metadata, f, indent=2)
-
-    # Initialize empty files
-    for file in ["investigation.json", "analyst_notes.json", "evidence.json"]:
-        with open(os.path.join(case_path, file), "w") as f:
-            json.dump([], f)
-
-    return case_id
+class StoreLayer:
+    """Passes every case_manager call through to the store it wraps."""
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def create_case(self, case_name, analyst, scope):
+        return self.inner.create_case(case_name, analyst, scope)
+
+    def update_case(self, case_id, data, filename):
+        return self.inner.update_case(case_id, data, filename)
+
+    def save_analyst_notes(self, case_id, notes):
+        return self.inner.save_analyst_notes(case_id, notes)
+
+    def add_evidence_many(self, case_id, items):
+        return self.inner.add_evidence_many(case_id, items)
+
+    def iter_evidence(self, case_id):
+        return self.inner.iter_evidence(case_id)
+
+    def load_case_file(self, case_id, filename, default=None):
+        return self.inner.load_case_file(case_id, filename, default)
+
+    def get_case(self, case_id):
+        return self.inner.get_case(case_id)
+
+    def list_cases(self, analyst=None, status=None, limit=50, offset=0, platform=None):
+        return self.inner.list_cases(analyst, status, limit, offset, platform)
+
+    def iter_investigations(self):
+        return self.inner.iter_investigations()
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Waits for queued writes in any layer below; True when nothing is left."""
+        inner_flush = getattr(self.inner, "flush", None)
+        return inner_flush(timeout) if inner_flush else True
+
+    def queued(self):
+        """Writes accepted but not yet persisted, in this layer and below."""
+        inner_queued = getattr(self.inner, "queued", None)
+        return inner_queued() if inner_queued else 0
+
+    def queued_documents(self, filename):
+        """{case_id: data} of `filename` documents accepted but not yet persisted."""
+        inner_queued = getattr(self.inner, "queued_documents", None)
+        return inner_queued(filename) if inner_queued else {}
+
+
+class IndexedStore(StoreLayer):
+    """
+    Feeds investigations and evidence into the cross-case index
+    (helpers/case_index.py) once the store below has them. An index
+    failure is logged, never allowed to lose the case data itself.
+    """
+
+    def update_case(self, case_id, data, filename):
+        self.inner.update_case(case_id, data, filename)
+        if filename == "investigation.json":
+            try:
+                case_index.index_investigation(case_id, data)
+            except sqlite3.Error as e:
+                print(f"[!] Case index update failed for {case_id}: {e}")
+
+    def add_evidence_many(self, case_id, items):
+        added = self.inner.add_evidence_many(case_id, items)
+        try:
+            case_index.index_evidence(case_id, added)
+        except sqlite3.Error as e:
+            print(f"[!] Case index update failed for {case_id}: {e}")
+        return added
+
+
+class WriteBehindStore(StoreLayer):
+    """
+    update_case only queues the document; one writer thread persists it
+    through the store below, so HTTP responses never wait on disk. A
+    document queued again before it is written just takes the newer data.
+    Reads of a queued document are answered from the queue, so callers
+    always see their writes.
+    """
+
+    def __init__(self, inner):
+        super().__init__(inner)
+        self._pending = {}
+        self._writing = {}
+        self._cond = threading.Condition()
+        self._writer = None
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                key = next(iter(self._pending))
+                data = self._writing[key] = self._pending.pop(key)
+            try:
+                self.inner.update_case(key[0], data, key[1])
+            except Exception as e:
+                print(f"[!] Write-behind failed for {key[1]} of case {key[0]}: {e}")
+            finally:
+                with self._cond:
+                    self._writing.pop(key, None)
+                    self._cond.notify_all()
+
+    def update_case(self, case_id, data, filename):
+        """Queues data as the case's `filename` document. Don't mutate data afterwards."""
+        with self._cond:
+            self._pending[(case_id, filename)] = data
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="case-writer", daemon=True)
+                self._writer.start()
+            self._cond.notify_all()
+
+    def load_case_file(self, case_id, filename, default=None):
+        key = (case_id, filename)
+        with self._cond:
+            if key in self._pending:
+                return self._pending[key]
+            if key in self._writing:
+                return self._writing[key]
+        return self.inner.load_case_file(case_id, filename, default)
+
+    def iter_investigations(self):
+        """Queued investigations from memory, then the stored ones they don't supersede (no flush)."""
+        queued = self.queued_documents("investigation.json")
+        yield from (data for data in queued.values() if data)
+        for data in self.inner.iter_investigations():
+            if not (isinstance(data, dict) and data.get("case_id") in queued):
+                yield data
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Waits until every queued write is persisted; False if timeout ran out first."""
+        end = time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._writing:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return super().flush(max(0, end - time.monotonic()))
+
+    def queued(self):
+        with self._cond:
+            queued = len(self._pending) + len(self._writing)
+        return queued + super().queued()
+
+    def queued_documents(self, filename):
+        documents = super().queued_documents(filename)
+        with self._cond:
+            # Pending data is newer than the copy being written
+            for (case_id, name), data in [*self._writing.items(), *self._pending.items()]:
+                if name == filename:
+                    documents[case_id] = data
+        return documents
+
+
+def build_store(backend=CASE_STORE, write_behind=WRITE_BEHIND):
+    store = IndexedStore(case_store if backend == "sqlite" else case_files)
+    return WriteBehindStore(store) if write_behind else store
+
+store = build_store()
 
 # -----------------------------
-# UPDATE CASE FILE
+# CASE MANAGER API
 # -----------------------------
+def create_case(case_name, analyst, scope):
+    return store.create_case(case_name, analyst, scope)
+
 def update_case(case_id, data, filename):
-    path = os.path.join(BASE_DIR, f"case_{case_id}", filename)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    return store.update_case(case_id, data, filename)
 
-# -----------------------------
-# ANALYST NOTES
-# -----------------------------
 def save_analyst_notes(case_id, notes):
-    path = os.path.join(BASE_DIR, f"case_{case_id}", "analyst_notes.json")
-    notes["updated_at"] = datetime.now(timezone.utc).isoformat()
-    
-    with open(path, "w") as f:
-        json.dump(notes, f, indent=2)
+    return store.save_analyst_notes(case_id, notes)
+
+def add_evidence_many(case_id, items):
+    """Logs every item whose URL the case has not logged yet; returns the new entries."""
+    return store.add_evidence_many(case_id, items)
+
+def add_evidence(case_id, evidence):
+    """Logs one item; returns the entry, or None if its URL is already in the case."""
+    added = add_evidence_many(case_id, [evidence])
+    return added[0] if added else None
+
+def iter_evidence(case_id):
+    """Yields a case's evidence in collection order, first entry per URL only."""
+    return store.iter_evidence(case_id)
+
+def load_case_file(case_id, filename, default=None):
+    return store.load_case_file(case_id, filename, default)
+
+def get_case(case_id):
+    return store.get_case(case_id)
+
+def list_cases(analyst=None, status=None, limit=50, offset=0, platform=None):
+    """Newest first, optionally filtered by analyst, status and a platform the case found the target on."""
+    return store.list_cases(analyst, status, limit, offset, platform)
+
+def iter_investigations():
+    """Every non-empty investigation in the archive."""
+    return store.iter_investigations()
+
+def flush(timeout=FLUSH_TIMEOUT):
+    """Waits until every queued write is persisted; False if timeout ran out first."""
+    return store.flush(timeout)
 
 # -----------------------------
-# EVIDENCE LOGGING
+# CROSS-CASE LOOKUP
 # -----------------------------
-def add_evidence(case_id, evidence):
-    path = os.path.join(BASE_DIR, f"case_{case_id}", "evidence.json")
-    
-    evidence_log = []
-    if os.path.exists(path):
-        try:
-            with open(path, "r") as f:
-                evidence_log = json.load(f)
-        except:
-            evidence_log = []
-
-    evidence_entry = {
-        "evidence_id": str(uuid.uuid4()),
-        "platform": evidence.get("platform"),
-        "url": evidence.get("url"),
-        "type": evidence.get("type", "profile"),
-        "analyst": evidence.get("analyst", "Unknown"),
-        "notes": evidence.get("notes", ""),
-        "confidence": evidence.get("confidence", "MEDIUM"),
-        "collected_at": datetime.now(timezone.utc).isoformat(),
-        "images": evidence.get("images", [])
-    }
-
-    evidence_log.append(evidence_entry)
-
-    with open(path, "w") as f:
-        json.dump(evidence_log, f, indent=2)
-
-    return evidence_entry
\ No newline at end of file
+_index_build_lock = threading.Lock()
+
+def find_cases(query, kind=None, limit=200):
+    """
+    Cases in which an identifier appeared; the index is built from the
+    archive on first use. Investigations still queued for writing are
+    matched from memory, so a lookup never waits on the case writer.
+    """
+    if not case_index.is_built():
+        with _index_build_lock:
+            if not case_index.is_built():
+                case_index.rebuild(iter_investigations, iter_evidence)
+    return case_index.lookup(query, kind, limit, overlay=store.queued_documents("investigation.json"))
+
+def _flush_at_exit():
+    if not flush():
+        print(f"[!] {store.queued()} case writes still queued at exit")
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,227 @@
+import os
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from helpers import json_codec
+from helpers.evidence import new_entry, normalize_url, platform_hits
+
+# SQLite implementation of the case_manager API, selected with
+# OSINT_CASE_STORE=sqlite. Case metadata, platform hits, evidence and notes
+# live in indexed tables so listing/filtering cases never touches the filesystem.
+DB_PATH = os.environ.get("OSINT_CASE_DB", os.path.join("cases", "cases.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    case_id     TEXT PRIMARY KEY,
+    case_name   TEXT,
+    analyst     TEXT,
+    scope       TEXT,
+    status      TEXT,
+    created_at  TEXT,
+    updated_at  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cases_created ON cases(created_at);
+CREATE INDEX IF NOT EXISTS idx_cases_analyst ON cases(analyst, created_at);
+CREATE INDEX IF NOT EXISTS idx_cases_status ON cases(status, created_at);
+
+-- Whole JSON documents written through update_case (investigation.json, ...)
+CREATE TABLE IF NOT EXISTS documents (
+    case_id     TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    body        TEXT NOT NULL,
+    updated_at  TEXT,
+    PRIMARY KEY (case_id, name)
+);
+
+-- Platforms each case's investigation found the target on, refreshed by update_case
+CREATE TABLE IF NOT EXISTS platform_hits (
+    case_id     TEXT NOT NULL,
+    platform    TEXT NOT NULL,
+    url         TEXT,
+    category    TEXT,
+    PRIMARY KEY (case_id, platform)
+);
+CREATE INDEX IF NOT EXISTS idx_hits_platform ON platform_hits(platform);
+
+CREATE TABLE IF NOT EXISTS evidence (
+    seq          INTEGER PRIMARY KEY AUTOINCREMENT,
+    evidence_id  TEXT UNIQUE,
+    case_id      TEXT NOT NULL,
+    platform     TEXT,
+    url          TEXT,
+    url_key      TEXT,
+    type         TEXT,
+    analyst      TEXT,
+    notes        TEXT,
+    confidence   TEXT,
+    collected_at TEXT,
+    images       TEXT,
+    UNIQUE (case_id, url_key)
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_case ON evidence(case_id, seq);
+
+CREATE TABLE IF NOT EXISTS notes (
+    case_id     TEXT PRIMARY KEY,
+    body        TEXT NOT NULL,
+    updated_at  TEXT
+);
+"""
+
+EVIDENCE_COLUMNS = ("evidence_id", "platform", "url", "type", "analyst", "notes",
+                    "confidence", "collected_at", "images")
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def connect(path=None, schema=SCHEMA):
+    """Per-thread connection (WAL, so readers never block the writer)."""
+    path = path or DB_PATH
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conns[path] = conn
+    if (path, schema) not in _schema_ready:
+        with _schema_lock:
+            if (path, schema) not in _schema_ready:
+                conn.executescript(schema)
+                _schema_ready.add((path, schema))
+    return conn
+
+
+def _case_row(row):
+    case = dict(row)
+    case["scope"] = json.loads(case["scope"] or "{}")
+    return case
+
+
+def _evidence_row(row):
+    entry = {k: row[k] for k in EVIDENCE_COLUMNS}
+    entry["images"] = json.loads(entry["images"] or "[]")
+    return entry
+
+
+# -----------------------------
+# case_manager API
+# -----------------------------
+def create_case(case_name, analyst, scope, case_id=None, created_at=None, status="OPEN", conn=None):
+    conn = conn or connect()
+    case_id = case_id or str(uuid.uuid4())
+    created_at = created_at or _now()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO cases (case_id, case_name, analyst, scope, status, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (case_id, case_name, analyst, json.dumps(scope or {}), status, created_at, created_at))
+    return case_id
+
+
+def update_case(case_id, data, filename, conn=None):
+    """Stores data as the case's `filename` document; investigation.json also refreshes platform_hits."""
+    conn = conn or connect()
+    now = _now()
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO documents (case_id, name, body, updated_at) VALUES (?, ?, ?, ?)",
+                     (case_id, filename, json_codec.dumps(data).decode("utf-8"), now))
+        if filename == "investigation.json":
+            conn.execute("DELETE FROM platform_hits WHERE case_id = ?", (case_id,))
+            conn.executemany("INSERT OR REPLACE INTO platform_hits (case_id, platform, url, category)"
+                             " VALUES (?, ?, ?, ?)", [(case_id, *hit) for hit in platform_hits(data)])
+        conn.execute("UPDATE cases SET updated_at = ? WHERE case_id = ?", (now, case_id))
+
+
+def save_analyst_notes(case_id, notes, conn=None):
+    conn = conn or connect()
+    notes["updated_at"] = _now()
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO notes (case_id, body, updated_at) VALUES (?, ?, ?)",
+                     (case_id, json.dumps(notes, default=str), notes["updated_at"]))
+
+
+def add_evidence_many(case_id, items, conn=None):
+    """Inserts items in one transaction; rows whose URL the case already has are ignored."""
+    conn = conn or connect()
+    added = []
+    with conn:
+        for evidence in items:
+            entry = evidence if evidence.get("evidence_id") else new_entry(evidence)
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO evidence (evidence_id, case_id, platform, url, url_key, type, analyst,"
+                " notes, confidence, collected_at, images) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry["evidence_id"], case_id, entry.get("platform"), entry.get("url"),
+                 normalize_url(entry.get("url")), entry.get("type"), entry.get("analyst"), entry.get("notes"),
+                 entry.get("confidence"), entry.get("collected_at"), json.dumps(entry.get("images") or [])))
+            if cur.rowcount:
+                added.append(entry)
+    return added
+
+
+def add_evidence(case_id, evidence, conn=None):
+    added = add_evidence_many(case_id, [evidence], conn)
+    return added[0] if added else None
+
+
+def iter_evidence(case_id, conn=None):
+    conn = conn or connect()
+    for row in conn.execute("SELECT * FROM evidence WHERE case_id = ? ORDER BY seq", (case_id,)):
+        yield _evidence_row(row)
+
+
+def get_case(case_id, conn=None):
+    conn = conn or connect()
+    row = conn.execute("SELECT * FROM cases WHERE case_id = ?", (case_id,)).fetchone()
+    return _case_row(row) if row else None
+
+
+def load_case_file(case_id, filename, default=None, conn=None):
+    conn = conn or connect()
+    if filename == "metadata.json":
+        case = get_case(case_id, conn)
+        return case if case is not None else default
+    if filename == "analyst_notes.json":
+        row = conn.execute("SELECT body FROM notes WHERE case_id = ?", (case_id,)).fetchone()
+    else:
+        row = conn.execute("SELECT body FROM documents WHERE case_id = ? AND name = ?",
+                           (case_id, filename)).fetchone()
+    return json_codec.loads(row["body"]) if row else default
+
+
+def list_cases(analyst=None, status=None, limit=50, offset=0, platform=None, conn=None):
+    """Newest first, filtered through the (analyst|status, created_at) and platform_hits indexes."""
+    conn = conn or connect()
+    where, args = [], []
+    if analyst:
+        where.append("analyst = ?")
+        args.append(analyst)
+    if status:
+        where.append("status = ?")
+        args.append(status)
+    if platform:
+        where.append("case_id IN (SELECT case_id FROM platform_hits WHERE platform = ?)")
+        args.append(platform)
+    sql = "SELECT * FROM cases"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+    return [_case_row(r) for r in conn.execute(sql, args + [limit, offset])]
+
+
+def iter_investigations(conn=None):
+    conn = conn or connect()
+    for row in conn.execute("SELECT body FROM documents WHERE name = 'investigation.json'"):
+        yield json_codec.loads(row["body"])
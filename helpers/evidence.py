@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlunsplit
+
+# Evidence entry helpers shared by the case stores (helpers/case_files.py
+# and helpers/case_store.py), so neither has to import the other.
+
+
+def normalize_url(url):
+    """Dedupe key: scheme/host lower-cased, trailing slash and fragment dropped."""
+    if not url:
+        return None
+    parts = urlsplit(str(url).strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+def platform_hits(investigation):
+    """(platform, url, category) for every platform the investigation found the target on."""
+    results = investigation.get("username_results") if isinstance(investigation, dict) else None
+    for platform, r in (results or {}).items():
+        if isinstance(r, dict) and r.get("found"):
+            yield platform, r.get("url"), r.get("category")
+
+
+def new_entry(evidence):
+    """A stored evidence entry (fresh id and timestamp) from a submitted item."""
+    return {
+        "evidence_id": str(uuid.uuid4()),
+        "platform": evidence.get("platform"),
+        "url": evidence.get("url"),
+        "type": evidence.get("type", "profile"),
+        "analyst": evidence.get("analyst", "Unknown"),
+        "notes": evidence.get("notes", ""),
+        "confidence": evidence.get("confidence", "MEDIUM"),
+        "collected_at": datetime.now(timezone.utc).isoformat(),
+        "images": evidence.get("images", [])
+    }
@@ -0,0 +1,275 @@
+import concurrent.futures
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+JOB_WORKERS = int(os.environ.get("OSINT_JOB_WORKERS", 4))
+# Interactive streamed scans get a pool of their own so queued background
+# and bulk jobs never hold up a client that is watching its scan live
+STREAM_WORKERS = int(os.environ.get("OSINT_STREAM_WORKERS", 4))
+# Bulk scans get their own, wider pool so hundreds of targets don't queue behind 4 slots
+BULK_WORKERS = int(os.environ.get("OSINT_BULK_WORKERS", 16))
+# Finished jobs kept around for polling before the oldest are dropped
+# (jobs of a batch that is still running are never dropped)
+MAX_JOBS = int(os.environ.get("OSINT_MAX_JOBS", 500))
+# Platform progress of a running job is persisted at most this often
+# (status and stage changes are persisted as they happen)
+PERSIST_INTERVAL = float(os.environ.get("OSINT_JOB_PERSIST_INTERVAL", 1.0))
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+
+class Job:
+    """
+    State of one background scan: lifecycle status, per-stage status and
+    per-platform counters. Worker threads update it through the helper
+    methods; the status endpoint reads it through snapshot().
+    Every update is also appended to an event log that streaming clients
+    follow with iter_events(), so late subscribers replay what they missed.
+    persist, if given, receives a snapshot after each change so workers in
+    other processes can report the job's status.
+    """
+
+    def __init__(self, case_id, target=None, persist=None):
+        self.job_id = str(uuid.uuid4())
+        self.case_id = case_id
+        self.target = target or {}
+        self.status = QUEUED
+        self.stages = {}
+        self.platforms = {"total": 0, "done": 0, "found": 0}
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.events = []
+        self._events_cond = threading.Condition()
+        self.created_at = datetime.now(timezone.utc).isoformat()
+        self.updated_at = self.created_at
+        self._lock = threading.Lock()
+        self._persist = persist
+        self._persisted_at = 0.0
+
+    def _touch(self):
+        self.updated_at = datetime.now(timezone.utc).isoformat()
+
+    def _save(self, force=True):
+        if self._persist is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._persisted_at < PERSIST_INTERVAL:
+            return
+        self._persisted_at = now
+        try:
+            self._persist(self.snapshot())
+        except Exception as e:
+            print(f"[!] Could not persist job {self.job_id}: {e}")
+
+    @property
+    def finished(self):
+        return self.status in (COMPLETED, FAILED, CANCELLED)
+
+    def publish(self, event, data=None):
+        # Snapshot the payload now: later stages mutate the dicts a stage
+        # returned, and replays must show what the stage actually produced
+        data = json.loads(json.dumps(data, default=str))
+        with self._events_cond:
+            self.events.append({"seq": len(self.events), "event": event, "progress": self.progress(), "data": data})
+            self._events_cond.notify_all()
+
+    def iter_events(self, start=0, keepalive=15):
+        """
+        Yields events from index start until the job finishes. None is
+        yielded after keepalive seconds of silence so streams stay open.
+        """
+        i = start
+        while True:
+            with self._events_cond:
+                if i >= len(self.events) and not self.finished:
+                    self._events_cond.wait(timeout=keepalive)
+                batch = self.events[i:]
+                done = self.finished
+            if not batch and not done:
+                yield None
+            for e in batch:
+                yield e
+            i += len(batch)
+            if done and i >= len(self.events):
+                return
+
+    def set_status(self, status):
+        # Status change and its event land together so a follower never
+        # sees a finished job without its final status event.
+        with self._events_cond:
+            with self._lock:
+                self.status = status
+                self._touch()
+            self.publish("status", {"status": status, "error": self.error})
+        self._save()
+
+    def stage_event(self, name, state, output=None):
+        with self._lock:
+            self.stages[name] = state
+            self._touch()
+        if state in ("done", "failed", "timed_out"):
+            self.publish("stage", {"stage": name, "state": state, "result": output})
+        self._save()
+
+    def platform_total(self, total):
+        with self._lock:
+            self.platforms["total"] = total
+            self._touch()
+
+    def platform_done(self, platform, result):
+        with self._lock:
+            self.platforms["done"] += 1
+            if result:
+                self.platforms["found"] += 1
+            self._touch()
+        if result:
+            self.publish("platform", result)
+        self._save(force=False)
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def progress(self):
+        """Rough 0-100 figure: finished stages, with the username scan weighted by platforms probed."""
+        if self.status == COMPLETED:
+            return 100
+        if not self.stages:
+            return 0
+        finished = sum(1 for s in self.stages.values() if s in ("done", "failed", "skipped", "cancelled", "timed_out"))
+        if self.stages.get("username") == "running" and self.platforms["total"]:
+            finished += self.platforms["done"] / self.platforms["total"]
+        return min(99, int(finished * 100 / len(self.stages)))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "case_id": self.case_id,
+                "target": self.target,
+                "status": self.status,
+                "progress": self.progress(),
+                "stages": dict(self.stages),
+                "platforms": dict(self.platforms),
+                "error": self.error,
+                "created_at": self.created_at,
+                "updated_at": self.updated_at
+            }
+
+
+class JobManager:
+    """
+    Runs scans off the request thread and keeps their Job records for
+    polling. The records live in this process; persist(snapshot) is handed
+    to every job so its status can also be kept somewhere shared.
+    """
+
+    def __init__(self, max_workers=None, persist=None):
+        self._persist = persist
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or JOB_WORKERS)
+        self._jobs = {}
+        self._by_case = {}
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def submit(self, case_id, func, target=None, batch_id=None):
+        """
+        Queues func(job) on the worker pool and returns the Job immediately.
+        Whatever func returns is kept as job.result. batch_id (from
+        create_batch) adds the job to that batch.
+        """
+        job = Job(case_id, target, self._persist)
+        job._save()
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+            self._by_case[case_id] = job.job_id
+            if batch_id is not None:
+                self._batches[batch_id].append(job.job_id)
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def _prune(self):
+        # A batch still running keeps all its jobs, so its snapshot stays complete
+        live = set()
+        for job_ids in self._batches.values():
+            if any(i in self._jobs and not self._jobs[i].finished for i in job_ids):
+                live.update(job_ids)
+        finished = [j for j in self._jobs.values() if j.finished and j.job_id not in live]
+        overflow = len(self._jobs) - MAX_JOBS + 1
+        for j in sorted(finished, key=lambda j: j.updated_at)[:max(0, overflow)]:
+            del self._jobs[j.job_id]
+            if self._by_case.get(j.case_id) == j.job_id:
+                del self._by_case[j.case_id]
+        for batch_id, job_ids in list(self._batches.items()):
+            if job_ids and not any(i in self._jobs for i in job_ids):
+                del self._batches[batch_id]
+
+    def _run(self, job, func):
+        if job.cancelled:
+            job.set_status(CANCELLED)
+            return
+        job.set_status(RUNNING)
+        try:
+            job.result = func(job)
+            job.publish("result", job.result)
+            job.set_status(CANCELLED if job.cancelled else COMPLETED)
+        except Exception as e:
+            print(f"[!] Job {job.job_id} failed: {e}")
+            job.error = str(e)
+            job.set_status(FAILED)
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def get_by_case(self, case_id):
+        job_id = self._by_case.get(case_id)
+        return self._jobs.get(job_id) if job_id else None
+
+    def create_batch(self, jobs=()):
+        """
+        Groups jobs under one batch id for bulk polling. Create it before
+        submitting (submit(..., batch_id=)) so pruning already sees the
+        batch while the rest of its jobs are still being queued.
+        """
+        batch_id = str(uuid.uuid4())
+        with self._lock:
+            self._batches[batch_id] = [j.job_id for j in jobs]
+        return batch_id
+
+    def batch_snapshot(self, batch_id):
+        job_ids = self._batches.get(batch_id)
+        if job_ids is None:
+            return None
+        snapshots = [j.snapshot() for j in (self._jobs.get(i) for i in job_ids) if j is not None]
+        counts = {}
+        for s in snapshots:
+            counts[s["status"]] = counts.get(s["status"], 0) + 1
+        return {
+            "batch_id": batch_id,
+            "total": len(job_ids),
+            "counts": counts,
+            "finished": all(s["status"] in (COMPLETED, FAILED, CANCELLED) for s in snapshots),
+            "jobs": [{k: s[k] for k in ("job_id", "case_id", "target", "status", "progress", "error")} for s in snapshots]
+        }
+
+    def cancel_batch(self, batch_id):
+        for job_id in self._batches.get(batch_id, []):
+            self.cancel(job_id)
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status in (QUEUED, RUNNING):
+            job.cancel_event.set()
+        return job
@@ -0,0 +1,102 @@
+import gzip
+import json
+import os
+import tempfile
+
+# Faster encoder/decoder when installed; the stdlib json module otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# On-disk encodings for case documents. Readers detect the format from the
+# file's first bytes, so files written with any encoding stay readable.
+#   json     indented JSON (the original format)
+#   compact  minified JSON
+#   gzip     minified JSON, gzip-compressed
+#   zstd     minified JSON, zstd-compressed (needs `zstandard`, else gzip)
+ENCODINGS = ("json", "compact", "gzip", "zstd")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_LEVEL = int(os.environ.get("OSINT_GZIP_LEVEL", 5))
+ZSTD_LEVEL = int(os.environ.get("OSINT_ZSTD_LEVEL", 3))
+
+
+def dumps(data, pretty=False):
+    """data as UTF-8 JSON bytes; anything not JSON-native is stringified."""
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            return orjson.dumps(data, default=str, option=option)
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers wider than 64 bits; the stdlib handles those
+            pass
+    if pretty:
+        return json.dumps(data, indent=2, default=str).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def encode(data, encoding="compact"):
+    if encoding == "json":
+        return dumps(data, pretty=True)
+    raw = dumps(data)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if encoding in ("gzip", "zstd"):
+        return gzip.compress(raw, compresslevel=GZIP_LEVEL)
+    return raw
+
+
+def decode(raw):
+    """Inverse of encode for every encoding, including legacy plain files."""
+    if raw.startswith(GZIP_MAGIC):
+        raw = gzip.decompress(raw)
+    elif raw.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("zstd-compressed document but `zstandard` is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(raw, max_output_size=1 << 30)
+    return loads(raw)
+
+
+def read(path, default=None):
+    """Decoded document at path, or default when missing or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return decode(f.read())
+    except (OSError, ValueError, EOFError):
+        return default
+
+
+def write_atomic(path, data, encoding="compact", fsync=True):
+    """
+    Writes data to a temp file in the same directory and renames it over
+    path, so readers (and a crash) only ever see the old or the new file.
+    """
+    payload = encode(data, encoding)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return len(payload)
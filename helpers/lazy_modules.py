@@ -0,0 +1,126 @@
+"""
+Deferred imports for the intelligence modules. app.py binds each stage
+function to a lazy() stand-in, so a module (and heavy dependencies such as
+phonenumbers' geocoder data, dnspython or BeautifulSoup) is only imported
+when a stage first calls into it. warm_up() imports them ahead of time in
+a background thread; report() lists what each import cost.
+
+    python -m helpers.lazy_modules    # import cost of every registered module
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+
+# --- CONFIGURATION ---
+# Import every registered module in a background thread once the app is up
+WARMUP = os.environ.get("OSINT_WARMUP", "0") == "1"
+
+_registered = []
+_timings = {}
+_lock = threading.Lock()
+_warmup_thread = None
+
+
+def load(module_name, trigger="call"):
+    """Imports module_name (once), recording how long it took and what triggered it."""
+    module = sys.modules.get(module_name)
+    if module is not None and module_name in _timings:
+        return module
+    before = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        with _lock:
+            _timings.setdefault(module_name, {"seconds": round(time.perf_counter() - start, 4),
+                                              "trigger": trigger, "error": str(e)})
+        raise
+    elapsed = time.perf_counter() - start
+    with _lock:
+        # A concurrent import of the same module waited on importlib's lock; keep the first record
+        if module_name not in _timings:
+            _timings[module_name] = {"seconds": round(elapsed, 4), "trigger": trigger,
+                                     "new_modules": len(sys.modules) - before}
+            print(f"[+] Loaded {module_name} in {elapsed * 1000:.0f} ms ({trigger})")
+    return module
+
+
+class LazyFunction:
+    """Callable stand-in for module_name.attr that imports the module on first call."""
+
+    __slots__ = ("module_name", "attr", "_fn")
+
+    def __init__(self, module_name, attr):
+        self.module_name = module_name
+        self.attr = attr
+        self._fn = None
+
+    def __call__(self, *args, **kwargs):
+        fn = self._fn
+        if fn is None:
+            fn = self._fn = getattr(load(self.module_name), self.attr)
+        return fn(*args, **kwargs)
+
+    def __repr__(self):
+        state = "loaded" if self._fn is not None else "deferred"
+        return f"<lazy {self.module_name}.{self.attr} ({state})>"
+
+
+def lazy(module_name, attr):
+    if module_name not in _registered:
+        _registered.append(module_name)
+    return LazyFunction(module_name, attr)
+
+
+def pending():
+    return [name for name in _registered if name not in _timings]
+
+
+def warm_up(background=True):
+    """Imports every registered module not loaded yet; in a daemon thread by default."""
+    global _warmup_thread
+
+    def run():
+        start = time.perf_counter()
+        for name in pending():
+            try:
+                load(name, "warmup")
+            except ImportError as e:
+                print(f"[!] Warm-up could not import {name}: {e}")
+        print(f"[+] Module warm-up finished in {time.perf_counter() - start:.2f}s")
+
+    if not background:
+        return run()
+    with _lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=run, name="module-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def report():
+    """Import cost per registered module, most expensive first, plus those still deferred."""
+    with _lock:
+        loaded = [{"module": name, **info} for name, info in _timings.items()]
+    loaded.sort(key=lambda m: m["seconds"], reverse=True)
+    return {
+        "loaded": loaded,
+        "deferred": pending(),
+        "import_seconds": round(sum(m["seconds"] for m in loaded), 4),
+        "modules_in_process": len(sys.modules)
+    }
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    start = time.perf_counter()
+    importlib.import_module("app")
+    print(f"app imported in {(time.perf_counter() - start) * 1000:.0f} ms")
+    # app registered its modules with the importable copy of this module, not __main__
+    registry = importlib.import_module("helpers.lazy_modules")
+    registry.warm_up(background=False)
+    print(f"{'self+deps ms':>14} | module")
+    for m in registry.report()["loaded"]:
+        print(f"{m['seconds'] * 1000:>14.1f} | {m['module']}{'  (' + m['error'] + ')' if m.get('error') else ''}")
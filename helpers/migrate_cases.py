@@ -0,0 +1,81 @@
+"""
+Copies file-based cases (cases/case_<id>/*.json, evidence.jsonl) into the
+SQLite case store. Safe to re-run: cases and documents are upserted and
+evidence already imported is skipped by its (case, URL) key.
+
+    python -m helpers.migrate_cases [cases_dir] [db_path]
+"""
+import os
+import sys
+import glob
+import json
+
+from helpers import case_index, case_store, json_codec
+from helpers.case_files import BASE_DIR, EVIDENCE_LOG, LEGACY_EVIDENCE
+
+
+def _read_json(path, default=None):
+    return json_codec.read(path, default)
+
+
+def _read_evidence(case_dir):
+    legacy = _read_json(os.path.join(case_dir, LEGACY_EVIDENCE), [])
+    entries = list(legacy) if isinstance(legacy, list) else []
+    try:
+        with open(os.path.join(case_dir, EVIDENCE_LOG), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def migrate(cases_dir=BASE_DIR, db_path=None):
+    conn = case_store.connect(db_path)
+    totals = {"cases": 0, "documents": 0, "evidence": 0, "notes": 0}
+
+    for case_dir in sorted(glob.glob(os.path.join(cases_dir, "case_*"))):
+        if not os.path.isdir(case_dir):
+            continue
+        case_id = os.path.basename(case_dir)[len("case_"):]
+        meta = _read_json(os.path.join(case_dir, "metadata.json"), {}) or {}
+        case_store.create_case(meta.get("case_name"), meta.get("analyst"), meta.get("scope"),
+                               case_id=case_id, created_at=meta.get("created_at"),
+                               status=meta.get("status", "OPEN"), conn=conn)
+        totals["cases"] += 1
+
+        for path in glob.glob(os.path.join(case_dir, "*.json")):
+            name = os.path.basename(path)
+            if name in ("metadata.json", "analyst_notes.json", LEGACY_EVIDENCE):
+                continue
+            data = _read_json(path)
+            if data:
+                case_store.update_case(case_id, data, name, conn=conn)
+                totals["documents"] += 1
+
+        notes = _read_json(os.path.join(case_dir, "analyst_notes.json"))
+        if isinstance(notes, dict) and notes:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO notes (case_id, body, updated_at) VALUES (?, ?, ?)",
+                             (case_id, json.dumps(notes, default=str), notes.get("updated_at")))
+            totals["notes"] += 1
+
+        totals["evidence"] += len(case_store.add_evidence_many(case_id, _read_evidence(case_dir), conn=conn))
+
+        # Keep the original timestamps rather than the migration time
+        if meta.get("updated_at"):
+            with conn:
+                conn.execute("UPDATE cases SET updated_at = ? WHERE case_id = ?", (meta["updated_at"], case_id))
+
+    # Imported rows bypassed the cross-case index; rebuild it on next lookup
+    case_index.invalidate()
+    print(f"[+] Migrated {totals['cases']} cases ({totals['documents']} documents, "
+          f"{totals['evidence']} new evidence rows, {totals['notes']} notes)")
+    return totals
+
+
+if __name__ == "__main__":
+    migrate(*sys.argv[1:3])
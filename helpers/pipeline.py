@@ -0,0 +1,174 @@
+import concurrent.futures
+import time
+
+
+class PipelineError(Exception):
+    pass
+
+
+class Stage:
+    """
+    One node of the scan graph.
+    func receives the dict of finished stage outputs and returns its own output.
+    deps lists the stage names whose outputs must exist before func runs.
+    after_deadline marks cheap local stages (merging, scoring) that still run
+    on whatever finished once the pipeline deadline has passed.
+    """
+
+    __slots__ = ("name", "func", "deps", "enabled", "after_deadline")
+
+    def __init__(self, name, func, deps=(), enabled=True, after_deadline=False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.enabled = enabled
+        self.after_deadline = after_deadline
+
+
+class Pipeline:
+    """
+    Runs a declarative stage graph on a thread pool.
+    Independent stages run concurrently, so total latency is the critical
+    path instead of the sum of every stage. A failed or disabled stage yields
+    None and its dependents still run (they already handle missing data).
+    on_event(stage_name, state, output) is called with pending/running/done/
+    failed/skipped/cancelled/timed_out; once cancel_event is set no further
+    stages start. When deadline (a time.monotonic() value) passes, run()
+    stops waiting: running stages are abandoned and they and every stage
+    not yet started are marked timed_out with a None output, except
+    after_deadline stages, which run inline in declaration order.
+    """
+
+    def __init__(self, stages, max_workers=8, on_event=None, cancel_event=None, deadline=None):
+        self.stages = {}
+        for s in stages:
+            if s.name in self.stages:
+                raise PipelineError(f"Duplicate stage: {s.name}")
+            self.stages[s.name] = s
+        self.max_workers = max_workers
+        self.on_event = on_event
+        self.cancel_event = cancel_event
+        self.deadline = deadline
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+        self.states = {}
+        self.timed_out = []
+        self._check_graph()
+
+    def _check_graph(self):
+        for s in self.stages.values():
+            for d in s.deps:
+                if d not in self.stages:
+                    raise PipelineError(f"Stage '{s.name}' depends on unknown stage '{d}'")
+
+        # Kahn's algorithm: anything left over is part of a cycle
+        indegree = {n: len(s.deps) for n, s in self.stages.items()}
+        ready = [n for n, d in indegree.items() if d == 0]
+        seen = 0
+        while ready:
+            n = ready.pop()
+            seen += 1
+            for s in self.stages.values():
+                if n in s.deps:
+                    indegree[s.name] -= 1
+                    if indegree[s.name] == 0:
+                        ready.append(s.name)
+        if seen != len(self.stages):
+            raise PipelineError("Stage graph contains a cycle")
+
+    def _emit(self, name, state, output=None):
+        self.states[name] = state
+        if self.on_event:
+            try:
+                self.on_event(name, state, output)
+            except Exception as e:
+                print(f"[!] Pipeline event hook failed: {e}")
+
+    def _expire(self, pending, running, started):
+        now = time.perf_counter()
+        for future, name in running.items():
+            future.cancel()
+            self.timings[name] = round(now - started[name], 3)
+            self._time_out(name)
+        for name, stage in pending.items():
+            if not (stage.after_deadline and stage.enabled):
+                self._time_out(name)
+                continue
+            self._emit(name, "running")
+            start = time.perf_counter()
+            try:
+                self.results[name] = stage.func(self.results)
+                self._emit(name, "done", self.results[name])
+            except Exception as e:
+                print(f"[!] Stage '{name}' failed: {e}")
+                self.errors[name] = str(e)
+                self.results[name] = None
+                self._emit(name, "failed")
+            self.timings[name] = round(time.perf_counter() - start, 3)
+        running.clear()
+        pending.clear()
+
+    def _time_out(self, name):
+        print(f"[!] Stage '{name}' timed out")
+        self.results[name] = None
+        self.timed_out.append(name)
+        self._emit(name, "timed_out")
+
+    def run(self):
+        pending = dict(self.stages)
+        done = set()
+        running = {}
+        started = {}
+
+        for name in pending:
+            self._emit(name, "pending")
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while pending or running:
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    for name in pending:
+                        self.results[name] = None
+                        self._emit(name, "cancelled")
+                    pending.clear()
+
+                for name, stage in list(pending.items()):
+                    if not all(d in done for d in stage.deps):
+                        continue
+                    del pending[name]
+                    if not stage.enabled:
+                        self.results[name] = None
+                        done.add(name)
+                        self._emit(name, "skipped")
+                        continue
+                    self._emit(name, "running")
+                    started[name] = time.perf_counter()
+                    running[executor.submit(stage.func, self.results)] = name
+
+                if not running:
+                    continue
+
+                remaining = None if self.deadline is None else self.deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._expire(pending, running, started)
+                    break
+                finished, _ = concurrent.futures.wait(
+                    running, timeout=remaining, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    self.timings[name] = round(time.perf_counter() - started[name], 3)
+                    try:
+                        self.results[name] = future.result()
+                        self._emit(name, "done", self.results[name])
+                    except Exception as e:
+                        print(f"[!] Stage '{name}' failed: {e}")
+                        self.errors[name] = str(e)
+                        self.results[name] = None
+                        self._emit(name, "failed")
+                    done.add(name)
+        finally:
+            # Abandoned stages keep their threads; never block on them
+            executor.shutdown(wait=not self.timed_out, cancel_futures=True)
+
+        return self.results
@@ -1,8 +1,4 @@
-import requests
-
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-}
+from osint_modules import http_client
 
 def check_spotify(email):
     """
@@ -10,7 +6,7 @@ def check_spotify(email):
     """
     url = "https://spclient.wg.spotify.com/signup/public/v1/account?validate=1&email={}"
     try:
-        r = requests.get(url.format(email), headers=HEADERS, timeout=5)
+        r = http_client.get(url.format(email), fallback_timeout=5)
         if r.status_code == 200:
             data = r.json()
             if data.get("status") == 20: # Status 20 = Account exists
@@ -1,46 +1,51 @@
-import requests
-import smtplib
-import dns.resolver
+from osint_modules import http_client, mail_domain
+from osint_modules.result_cache import cached
 
+@cached("pgp", key=lambda email: email.strip().lower(), default={"found": False})
 def check_pgp_keys(email):
     """
     Searches public HKP keyservers for PGP keys associated with the email.
     """
     url = f"https://keyserver.ubuntu.com/pks/lookup?search={email}&op=index&fingerprint=on&options=mr"
-    try:
-        r = requests.get(url, timeout=5)
-        if "pub:" in r.text:
-            return {
-                "found": True,
-                "server": "keyserver.ubuntu.com",
-                "details": "PGP Key Found (Encrypted Comm Used)"
-            }
-    except:
-        pass
+    r = http_client.get(url, fallback_timeout=5)
+    if "pub:" in r.text:
+        return {
+            "found": True,
+            "server": "keyserver.ubuntu.com",
+            "details": "PGP Key Found (Encrypted Comm Used)"
+        }
     return {"found": False}
 
 def smtp_analysis(email):
     """
     Performs a 'Safe' SMTP analysis (DNS MX Record + Banner Grab).
+    The MX answer is cached per domain for its DNS TTL and the banner per
+    mail server (osint_modules/mail_domain.py), so addresses sharing a
+    domain or mail host cost no extra network round trips.
     """
     try:
         domain = email.split('@')[1]
-        records = dns.resolver.resolve(domain, 'MX')
-        mx_record = str(records[0].exchange)
-        
-        # Connect to Mail Server (Banner Grab only)
-        server = smtplib.SMTP(mx_record, 25, timeout=5)
-        server.ehlo()
-        banner = server.docmd("NOOP")[1].decode('utf-8', errors='ignore')
-        server.quit()
+        mx = mail_domain.mx_lookup(domain)
+        if not mx["mx"]:
+            return {"valid_mx": False, "error": mx.get("error", "No MX records")}
+        mx_record = mx["mx"][0]["host"]
 
-        return {
+        # Connect to the preferred Mail Server (Banner Grab only)
+        smtp = mail_domain.smtp_probe(mx_record)
+        result = {
             "valid_mx": True,
             "mx_server": mx_record,
-            "banner": banner[:50] + "..." 
+            "mx_records": [r["host"] for r in mx["mx"]],
+            "mx_ttl": mx["ttl"],
+            "reachable": smtp["reachable"]
         }
+        if smtp.get("banner"):
+            result["banner"] = smtp["banner"][:50] + "..."
+        else:
+            result["smtp_error"] = smtp.get("error")
+        return result
     except Exception as e:
-        return {"valid_mx": False, "error": str(e)}
+        return {"valid_mx": False, "error": str(e) or type(e).__name__}
 
 def run_advanced_search(email):
     return {
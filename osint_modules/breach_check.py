@@ -1,51 +1,57 @@
-import requests
 import json
+import os
 import time
 
+if not __package__:
+    # Run as a script (python osint_modules/breach_check.py): make the package importable
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from osint_modules import http_client
+from osint_modules.result_cache import cached
+
 # --- CONFIGURATION ---
 # To make this robust, you eventually want an API Key from haveibeenpwned.com
 # For now, we will use a free preview technique or simulation based on real data structures.
 
+@cached("github_email", key=lambda username: username.strip().lower())
 def get_github_email(username):
     """
     TRICK: Scrapes GitHub's public API for commit activity.
     Developers often accidentally leave their email in their git config.
     """
     url = f"https://api.github.com/users/{username}/events/public"
-    try:
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            events = r.json()
-            for event in events:
-                if event["type"] == "PushEvent":
-                    for commit in event["payload"]["commits"]:
-                        email = commit["author"]["email"]
-                        # Filter out generic github no-reply emails
-                        if "users.noreply.github.com" not in email:
-                            return email
-    except Exception as e:
-        pass
+    r = http_client.get(url, fallback_timeout=5)
+    if r.status_code == 200:
+        events = r.json()
+        for event in events:
+            if event["type"] == "PushEvent":
+                for commit in event["payload"].get("commits", []):
+                    email = commit["author"]["email"]
+                    # Filter out generic github no-reply emails
+                    if "users.noreply.github.com" not in email:
+                        return email
     return None
 
+@cached("hudson_rock", key=lambda email: email.strip().lower())
 def check_hudson_rock(email):
     """
     REAL DATA: Checks Hudson Rock's free 'Cavalier' preview.
     Returns a list of 'Stealer Logs' or breaches if found.
     """
     url = f"https://cavalier.hudsonrock.com/api/json/v2/preview/search-by-login/osint-tools?login={email}"
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code == 200:
-            data = r.json()
-            # If the response contains 'stealers', the email is compromised
-            if data.get("stealers"):
-                return {
-                    "compromised": True,
-                    "count": len(data.get("stealers")),
-                    "sources": [s.get("computer_name", "Unknown Infostealer") for s in data.get("stealers")[:3]]
-                }
-    except:
-        pass
+    r = http_client.get(url, fallback_timeout=10)
+    if r.status_code == 429 or r.status_code >= 500:
+        r.raise_for_status()
+    if r.status_code == 200:
+        data = r.json()
+        # If the response contains 'stealers', the email is compromised
+        if data.get("stealers"):
+            return {
+                "compromised": True,
+                "count": len(data.get("stealers")),
+                "sources": [s.get("computer_name", "Unknown Infostealer") for s in data.get("stealers")[:3]]
+            }
     return None
 
 def simple_breach_check(username):
@@ -0,0 +1,63 @@
+import functools
+import os
+import re
+import threading
+
+# --- CONFIGURATION ---
+# Distinct first names remembered by the classifier
+MEMO_SIZE = int(os.environ.get("OSINT_DEMOGRAPHICS_MEMO", 4096))
+
+_detector = None
+_detector_lock = threading.Lock()
+_FIRST_NAME_RE = re.compile(r"[^\W\d_]+(?:['-][^\W\d_]+)*")
+
+
+def detector():
+    """The process-wide gender_guesser Detector (its name list loads once), or None if unavailable."""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                try:
+                    import gender_guesser.detector as gender
+                    _detector = gender.Detector(case_sensitive=False)
+                except ImportError:
+                    print("[!] gender_guesser missing, demographics disabled")
+                    _detector = False
+    return _detector or None
+
+
+def first_name(real_name):
+    """Normalized memo key: the first word of real_name, lower-cased."""
+    match = _FIRST_NAME_RE.search(real_name or "")
+    return match.group(0).lower() if match else None
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _classify(name):
+    guess = detector().get_gender(name)
+    if "female" in guess: return "Female"
+    if "male" in guess: return "Male"
+    return "Uncertain"
+
+
+def predict(real_name):
+    name = first_name(real_name)
+    if not name or detector() is None:
+        return "Unknown"
+    return _classify(name)
+
+
+def predict_many(real_names):
+    """{real_name: label} for every name, classifying each distinct first name once."""
+    if detector() is None:
+        return {n: "Unknown" for n in real_names}
+    keys = {n: first_name(n) for n in real_names}
+    labels = {k: _classify(k) for k in set(keys.values()) if k}
+    return {n: labels.get(k, "Unknown") for n, k in keys.items()}
+
+
+def stats():
+    info = _classify.cache_info()
+    return {"loaded": bool(_detector), "hits": info.hits, "misses": info.misses,
+            "size": info.currsize, "maxsize": info.maxsize}
@@ -1,6 +1,7 @@
 import re
 import hashlib
-import requests
+from osint_modules import http_client
+from osint_modules.result_cache import cached
 
 def generate_email_variations(email):
     local, domain = email.split("@")
@@ -16,6 +17,16 @@ def generate_email_variations(email):
     
     return list(variations)
 
+@cached("gravatar", key=lambda email, timeout=5: email.strip().lower())
+def gravatar_exists(email, timeout=5):
+    """True if Gravatar serves an avatar for this address (shared, cached lookup)."""
+    email_hash = hashlib.md5(email.strip().lower().encode()).hexdigest()
+    r = http_client.get(f"https://www.gravatar.com/avatar/{email_hash}?d=404", fallback_timeout=timeout)
+    if r.status_code == 404:
+        return False
+    r.raise_for_status()
+    return True
+
 def email_osint(email):
     result = {
         "valid": False,
@@ -38,15 +49,9 @@ def email_osint(email):
 
     # Gravatar check
     email_hash = hashlib.md5(email.lower().encode()).hexdigest()
-    url = f"https://www.gravatar.com/avatar/{email_hash}?d=404"
-    
-    try:
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            result["gravatar"]["exists"] = True
-            result["gravatar"]["profile_url"] = f"https://www.gravatar.com/{email_hash}"
-    except:
-        pass
+    if gravatar_exists(email):
+        result["gravatar"]["exists"] = True
+        result["gravatar"]["profile_url"] = f"https://www.gravatar.com/{email_hash}"
         
     result["breach_indicator"] = "Check via trusted breach intelligence (HIBP)"
     
@@ -1,16 +1,12 @@
-import requests
 import json
 import re
-
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-}
+from osint_modules import http_client
 
 def get_gaia_metadata(email):
     """THE GOLDEN KEY: Queries the legacy Picasa API."""
     url = f"https://picasaweb.google.com/data/entry/api/user/{email}?alt=json"
     try:
-        r = requests.get(url, headers=HEADERS, timeout=5)
+        r = http_client.get(url, fallback_timeout=5)
         if r.status_code == 200:
             data = r.json()
             entry = data.get("entry", {})
@@ -29,7 +25,7 @@ def check_google_calendar(email):
     """Checks if a Gmail address has a public Calendar."""
     url = f"https://calendar.google.com/calendar/ical/{email}/public/basic.ics"
     try:
-        r = requests.get(url, timeout=5)
+        r = http_client.get(url, fallback_timeout=5)
         if r.status_code == 200:
             cal_name = re.search(r'X-WR-CALNAME:(.*)', r.text)
             timezone = re.search(r'X-WR-TIMEZONE:(.*)', r.text)
@@ -0,0 +1,237 @@
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# --- CONFIGURATION ---
+# Token bucket per host: sustained requests/second and burst size.
+HOST_RATE = float(os.environ.get("OSINT_HOST_RATE", 5))
+HOST_BURST = int(os.environ.get("OSINT_HOST_BURST", 10))
+# Never queue longer than this for a token; the probe is reported throttled instead.
+MAX_TOKEN_WAIT = float(os.environ.get("OSINT_HOST_MAX_WAIT", 10))
+# A Retry-After up to this long is waited out and retried once; longer ones trip the breaker.
+MAX_RETRY_WAIT = float(os.environ.get("OSINT_MAX_RETRY_WAIT", 5))
+
+# Circuit breaker: consecutive throttled/failed probes before a platform is
+# marked degraded, and how long (doubling on repeat trips) it stays that way.
+BREAKER_THRESHOLD = int(os.environ.get("OSINT_BREAKER_THRESHOLD", 3))
+BREAKER_COOLDOWN = float(os.environ.get("OSINT_BREAKER_COOLDOWN", 60))
+BREAKER_MAX_COOLDOWN = float(os.environ.get("OSINT_BREAKER_MAX_COOLDOWN", 900))
+
+THROTTLED = "throttled"
+DEGRADED = "degraded"
+ERROR = "error"
+
+
+class ThrottledError(RuntimeError):
+    """A probe could not give a real answer because the site pushed back."""
+
+    def __init__(self, platform, reason, retry_after=None, state=THROTTLED):
+        super().__init__(f"{platform}: {reason}")
+        self.platform = platform
+        self.reason = reason
+        self.retry_after = retry_after
+        self.state = state
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def throttle_reason(response):
+    """Why a response is pushback rather than an answer, or None if it is usable."""
+    status = response.status_code
+    if status == 429:
+        return "HTTP 429"
+    if response.headers.get("cf-mitigated", "").lower() == "challenge":
+        return "challenge page"
+    if status >= 500:
+        return f"HTTP {status}"
+    return None
+
+
+# ==========================================
+#  RATE LIMITER
+# ==========================================
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait):
+        """
+        Takes a token (possibly going negative) and returns how long to wait
+        for it, or None without taking one if that would exceed max_wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max((1 - self.tokens) / self.rate if self.tokens < 1 else 0.0, self.blocked_until - now)
+            if wait > max_wait:
+                return None
+            self.tokens -= 1
+            self.waited += wait
+            return wait
+
+    def block(self, seconds):
+        """Holds every request to this host for seconds (server asked us to back off)."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+# ==========================================
+#  CIRCUIT BREAKER
+# ==========================================
+
+class Breaker:
+    """
+    closed -> open after BREAKER_THRESHOLD consecutive failures; open -> half-open
+    when the cooldown passes, letting one trial probe through. Success closes it,
+    failure re-opens it with a doubled cooldown.
+    """
+
+    def __init__(self):
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.trial = False
+        self.last_reason = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if not self.open_until:
+                return True
+            if time.monotonic() < self.open_until or self.trial:
+                return False
+            self.trial = True
+            return True
+
+    def release_trial(self):
+        with self._lock:
+            self.trial = False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.trips = 0
+            self.open_until = 0.0
+            self.trial = False
+
+    def failure(self, reason, retry_after=None):
+        with self._lock:
+            self.failures += 1
+            self.last_reason = reason
+            if self.trial or self.failures >= BREAKER_THRESHOLD or (retry_after or 0) > MAX_RETRY_WAIT:
+                cooldown = min(BREAKER_MAX_COOLDOWN, BREAKER_COOLDOWN * (2 ** self.trips))
+                cooldown = max(cooldown, min(retry_after or 0, BREAKER_MAX_COOLDOWN))
+                self.open_until = time.monotonic() + cooldown
+                self.trips += 1
+                self.trial = False
+                return cooldown
+            return None
+
+    def remaining(self):
+        return max(0.0, self.open_until - time.monotonic()) if self.open_until else 0.0
+
+
+# ==========================================
+#  REGISTRY
+# ==========================================
+
+_buckets = {}
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def bucket_for(host):
+    with _registry_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(HOST_RATE, HOST_BURST)
+        return _buckets[host]
+
+
+def breaker_for(platform):
+    with _registry_lock:
+        if platform not in _breakers:
+            _breakers[platform] = Breaker()
+        return _breakers[platform]
+
+
+def acquire(host, platform):
+    """Waits for a request slot to host, or raises ThrottledError if it is too far off."""
+    bucket = bucket_for(host)
+    wait = bucket.reserve(MAX_TOKEN_WAIT)
+    if wait is None:
+        blocked = bucket.blocked_until - time.monotonic()
+        if blocked > MAX_TOKEN_WAIT:
+            raise ThrottledError(platform, f"host backing off ({blocked:.0f}s left)", retry_after=round(blocked, 1))
+        raise ThrottledError(platform, "local rate limit queue full", retry_after=MAX_TOKEN_WAIT)
+    if wait > 0:
+        time.sleep(wait)
+
+
+def guarded(platform, host, probe):
+    """
+    Runs probe() behind the host's rate limiter and the platform's breaker.
+    probe raises ThrottledError on pushback; a short Retry-After is waited out
+    and retried once, anything else counts toward tripping the breaker.
+    """
+    breaker = breaker_for(platform)
+    if not breaker.allow():
+        raise ThrottledError(platform, f"degraded: {breaker.last_reason}",
+                             retry_after=round(breaker.remaining(), 1), state=DEGRADED)
+
+    for attempt in range(2):
+        try:
+            acquire(host, platform)
+        except ThrottledError:
+            # Our own queue is full; that says nothing about the site's health
+            breaker.release_trial()
+            raise
+        try:
+            result = probe()
+        except ThrottledError as e:
+            if e.retry_after:
+                bucket_for(host).block(min(e.retry_after, BREAKER_MAX_COOLDOWN))
+            if attempt == 0 and e.retry_after is not None and e.retry_after <= MAX_RETRY_WAIT:
+                continue
+            cooldown = breaker.failure(e.reason, e.retry_after)
+            if cooldown:
+                print(f"[!] {platform} degraded for {cooldown:.0f}s ({e.reason})")
+            raise
+        except Exception as e:
+            breaker.failure(str(e))
+            raise
+        breaker.success()
+        return result
+
+
+def stats():
+    """Per-host limiter and per-platform breaker state for /http_stats."""
+    with _registry_lock:
+        buckets = dict(_buckets)
+        breakers = dict(_breakers)
+    return {
+        "hosts": {h: {"tokens": round(b.tokens, 2), "waited_s": round(b.waited, 2),
+                      "blocked_s": round(max(0.0, b.blocked_until - time.monotonic()), 1)}
+                  for h, b in buckets.items()},
+        "degraded": {p: {"reason": b.last_reason, "retry_in_s": round(b.remaining(), 1)}
+                     for p, b in breakers.items() if b.remaining() > 0}
+    }
@@ -0,0 +1,167 @@
+import codecs
+import itertools
+import os
+import time
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+from requests.exceptions import StreamConsumedError
+
+# --- CONFIGURATION ---
+# Stop reading a profile page once </head> is seen or this many bytes arrived.
+HEAD_BYTE_CAP = int(os.environ.get("OSINT_HEAD_BYTE_CAP", 256 * 1024))
+CHUNK_SIZE = 16 * 1024
+
+
+class HeadMetaParser(HTMLParser):
+    """
+    Incremental parser that only cares about <title> and <meta> tags.
+    `done` flips as soon as the head is over (</head> or the first <body>).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.meta = {}
+        self.done = False
+        self._in_title = False
+        self._title_parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "title" and self.title is None:
+            self._in_title = True
+        elif tag == "meta":
+            a = dict(attrs)
+            key = a.get("property") or a.get("name")
+            if key and a.get("content") is not None:
+                # First occurrence wins, like soup.find()
+                self.meta.setdefault(key, a["content"])
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = "".join(self._title_parts).strip()
+        elif tag == "head":
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+
+
+def parse_head(chunks, encoding=None, max_bytes=None):
+    """
+    Feeds byte/str chunks to HeadMetaParser until the head ends or max_bytes
+    is reached. Returns (parser, text_read, bytes_read, parse_ms); bytes_read
+    only counts byte chunks (str chunks were downloaded earlier) and parse_ms
+    only counts parser time, not time spent waiting on the network.
+    """
+    max_bytes = max_bytes or HEAD_BYTE_CAP
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    parser = HeadMetaParser()
+    parts = []
+    taken = 0
+    read = 0
+    parse_s = 0.0
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        taken += len(chunk)
+        if isinstance(chunk, bytes):
+            read += len(chunk)
+            chunk = decoder.decode(chunk)
+        parts.append(chunk)
+        start = time.perf_counter()
+        parser.feed(chunk)
+        parse_s += time.perf_counter() - start
+        if parser.done or taken >= max_bytes:
+            break
+
+    return parser, "".join(parts), read, round(parse_s * 1000, 2)
+
+
+def iter_text(text):
+    """Slices an already-downloaded page so parse_head can stop early on it too."""
+    for i in range(0, len(text), CHUNK_SIZE):
+        yield text[i:i + CHUNK_SIZE]
+
+
+def _response_encoding(response):
+    enc = response.encoding or "utf-8"
+    try:
+        codecs.lookup(enc)
+    except LookupError:
+        enc = "utf-8"
+    return enc
+
+
+def _iter_stream(response):
+    """iter_content that just ends when an earlier read already drained the stream."""
+    try:
+        yield from response.iter_content(chunk_size=CHUNK_SIZE)
+    except StreamConsumedError:
+        return
+
+
+def read_head(response, max_bytes=None, prefix=None):
+    """
+    Streams a requests response (stream=True) and stops after the head.
+    prefix is text already pulled off the same stream (e.g. by stream_find).
+    """
+    chunks = _iter_stream(response)
+    if prefix:
+        chunks = itertools.chain(iter_text(prefix), chunks)
+    return parse_head(chunks, _response_encoding(response), max_bytes)
+
+
+def stream_find(response, marker, max_bytes):
+    """
+    Reads a streamed body until marker shows up or max_bytes were read.
+    Returns (found, text_read, bytes_read, complete); the rest of the body is
+    never fetched. complete means the body ended first, so text_read is all
+    of it; when it is False and found is too, the marker may still come later.
+    """
+    if not marker:
+        return False, "", 0, False
+    decoder = codecs.getincrementaldecoder(_response_encoding(response))(errors="replace")
+    parts = []
+    tail = ""
+    read = 0
+
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        read += len(chunk)
+        piece = decoder.decode(chunk)
+        parts.append(piece)
+        # Keep the end of the previous chunk so a marker split across chunks still matches
+        if marker in tail + piece:
+            return True, "".join(parts), read, False
+        tail = (tail + piece)[-(len(marker) - 1):] if len(marker) > 1 else ""
+        if read >= max_bytes:
+            return False, "".join(parts), read, False
+
+    parts.append(decoder.decode(b"", final=True))
+    return False, "".join(parts), read, True
+
+
+def read_rest(response, text_so_far):
+    """Downloads whatever is left of a streamed response for a full parse."""
+    decoder = codecs.getincrementaldecoder(_response_encoding(response))(errors="replace")
+    parts = [text_so_far]
+    read = 0
+    for chunk in _iter_stream(response):
+        read += len(chunk)
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), read
+
+
+def full_soup(html_text):
+    """Full BeautifulSoup parse; returns (soup, parse_ms)."""
+    start = time.perf_counter()
+    soup = BeautifulSoup(html_text, "html.parser")
+    return soup, round((time.perf_counter() - start) * 1000, 2)
@@ -0,0 +1,304 @@
+import concurrent.futures
+import os
+import socket
+import threading
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.retry import Retry
+
+from osint_modules import host_guard, latency
+from osint_modules.result_cache import get_cache
+
+# --- CONFIGURATION ---
+# One place for the defaults every OSINT module used to hard-code.
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9"
+}
+# Cold-start timeout; once a host has enough samples its timeout comes
+# from the latency histogram (see latency.py) instead.
+DEFAULT_TIMEOUT = 6
+
+# Keep-alive pools: how many hosts we keep pools for, and how many
+# sockets each host pool may hold open.
+POOL_HOSTS = int(os.environ.get("OSINT_HTTP_POOL_HOSTS", 256))
+POOL_MAXSIZE = int(os.environ.get("OSINT_HTTP_POOL_MAXSIZE", 16))
+
+# Only connection-level failures are retried; HTTP status codes are the
+# signal the modules inspect, so they are passed through untouched.
+RETRIES = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2, raise_on_status=False)
+
+# Host -> addresses for the shared session's connections only
+DNS_TTL = int(os.environ.get("OSINT_DNS_TTL", 300))
+DNS_CACHE_SIZE = int(os.environ.get("OSINT_DNS_CACHE_SIZE", 1024))
+
+# Hedged requests: for hosts whose p95 is at least HEDGE_MIN_P95 seconds, a
+# duplicate is sent once the primary has taken the host's median latency.
+HEDGE_ENABLED = os.environ.get("OSINT_HEDGE", "1") == "1"
+HEDGE_MIN_P95 = float(os.environ.get("OSINT_HEDGE_MIN_P95", 2.0))
+HEDGE_WORKERS = int(os.environ.get("OSINT_HEDGE_WORKERS", 32))
+# Each hedged request may occupy two hedge workers; when no pair is free the
+# request is sent unhedged on the calling thread rather than queued
+_hedge_slots = threading.BoundedSemaphore(max(1, HEDGE_WORKERS // 2))
+
+
+# ==========================================
+#  DNS CACHE
+# ==========================================
+
+dns_cache = get_cache("dns", maxsize=DNS_CACHE_SIZE, hit_ttl=DNS_TTL, miss_ttl=DNS_TTL,
+                      disk_dir=False, is_miss=lambda v: False)
+
+
+def resolve(host):
+    """Addresses for host in getaddrinfo order, cached (LRU + DNS_TTL); lookup errors are not cached."""
+    def load():
+        infos = socket.getaddrinfo(host, None, allowed_gai_family(), socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos))
+    return dns_cache.get_or_load(host, load)
+
+
+class _CachedDNSMixin:
+    """
+    Connects through resolve() instead of a fresh getaddrinfo per socket.
+    Only the shared session's pools use it; socket.getaddrinfo is untouched.
+    TLS SNI and certificate checks still use the host name.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = resolve(host)
+        except OSError:
+            addresses = None
+        if not addresses:
+            # Let urllib3 resolve it and raise its usual NameResolutionError
+            return super()._new_conn()
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+        finally:
+            self._dns_host = host
+        # Every cached address failed: resolve afresh next time
+        dns_cache.discard(host)
+        raise error
+
+
+class _CachedDNSConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSConnection
+
+
+class _CachedDNSHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter whose direct (non-proxied) connections use the DNS cache."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _CachedDNSPool, "https": _CachedDNSHTTPSPool}
+
+
+def clear_dns_cache():
+    dns_cache.clear()
+
+
+# ==========================================
+#  SHARED SESSION
+# ==========================================
+
+_session = None
+_session_lock = threading.Lock()
+_request_stats = Counter()
+
+
+def get_session():
+    """Returns the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                s.headers.update(DEFAULT_HEADERS)
+                adapter = CachedDNSAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE, max_retries=RETRIES)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                _session = s
+    return _session
+
+
+def _send(method, url, host, timeout, kwargs):
+    """One request, with its time-to-headers recorded in the host's histogram."""
+    try:
+        r = get_session().request(method, url, timeout=timeout, **kwargs)
+    except requests.Timeout:
+        latency.record_timeout(host)
+        raise
+    latency.record(host, r.elapsed.total_seconds())
+    return r
+
+
+_hedge_executor = None
+
+
+def _hedge_pool():
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _session_lock:
+            if _hedge_executor is None:
+                _hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=HEDGE_WORKERS, thread_name_prefix="osint-hedge")
+    return _hedge_executor
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _release_hedge_slot(futures):
+    """Frees the hedge slot once every request it started has finished."""
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            _hedge_slots.release()
+
+    for future in futures:
+        future.add_done_callback(done)
+
+
+def _hedged(method, url, host, timeout, delay, kwargs):
+    """
+    Sends the request, and a duplicate if no answer arrived delay seconds
+    after the send started. The first successful response wins.
+    """
+    if not _hedge_slots.acquire(blocking=False):
+        _request_stats["hedge_skipped"] += 1
+        return _send(method, url, host, timeout, kwargs)
+
+    executor = _hedge_pool()
+    started = threading.Event()
+
+    def send_primary():
+        started.set()
+        return _send(method, url, host, timeout, kwargs)
+
+    primary = executor.submit(send_primary)
+    futures = [primary]
+    try:
+        # A held slot means a free worker, but the delay still only counts from the send
+        started.wait()
+        try:
+            return primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+
+        # Hedges only use spare rate-limit tokens, never queue for one
+        if host_guard.bucket_for(host).reserve(0) is None:
+            return primary.result()
+        _request_stats["hedged"] += 1
+        backup = executor.submit(_send, method, url, host, timeout, kwargs)
+        futures.append(backup)
+        return _first_success(host, primary, backup)
+    finally:
+        _release_hedge_slot(futures)
+
+
+def _first_success(host, primary, backup):
+    """Result of whichever of the two requests succeeds first (the loser is closed when it lands)."""
+    winner = None
+    error = None
+    for future in concurrent.futures.as_completed((primary, backup)):
+        if future.exception() is None:
+            winner = future
+            break
+        error = error or future.exception()
+    if winner is None:
+        raise error
+
+    loser = backup if winner is primary else primary
+    loser.add_done_callback(_close_response)
+    latency.note_hedge(host, winner is backup)
+    return winner.result()
+
+
+def request(method, url, fallback_timeout=None, hedge=False, **kwargs):
+    """
+    Issues a request through the shared pool. Without an explicit timeout
+    the host's adaptive (p99 based) timeout is used, or fallback_timeout /
+    DEFAULT_TIMEOUT while the host is still unmeasured. hedge=True lets an
+    idempotent request to a chronically slow host race a duplicate.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    timeout = kwargs.pop("timeout", None) or latency.timeout_for(host, fallback_timeout or DEFAULT_TIMEOUT)
+    _request_stats[method.upper()] += 1
+
+    if hedge and HEDGE_ENABLED and method.upper() in ("GET", "HEAD"):
+        delay = latency.hedge_delay(host, HEDGE_MIN_P95)
+        if delay is not None:
+            return _hedged(method, url, host, timeout, delay, kwargs)
+    return _send(method, url, host, timeout, kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def head(url, **kwargs):
+    kwargs.setdefault("allow_redirects", True)
+    return request("HEAD", url, **kwargs)
+
+
+def get_pool_stats():
+    """
+    Snapshot of the keep-alive pools: per-host connections opened vs
+    requests served, DNS cache counters and per-host latency/timeouts.
+    """
+    pools = []
+    if _session is not None:
+        manager = _session.get_adapter("https://").poolmanager
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            pools.append({
+                "scheme": pool.scheme,
+                "host": pool.host,
+                "port": pool.port,
+                "connections_opened": pool.num_connections,
+                "requests_served": pool.num_requests,
+                "idle_connections": sum(1 for c in list(pool.pool.queue) if c is not None) if pool.pool else 0
+            })
+
+    return {
+        "requests": dict(_request_stats),
+        "pools": pools,
+        "dns": dns_cache.stats(),
+        "latency": latency.stats(DEFAULT_TIMEOUT)
+    }
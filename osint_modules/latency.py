@@ -0,0 +1,191 @@
+import atexit
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+
+# --- CONFIGURATION ---
+# Where histograms are persisted so tuned timeouts survive restarts ("" disables)
+LATENCY_FILE = os.environ.get("OSINT_LATENCY_FILE", "latency_stats.json")
+SAVE_INTERVAL = float(os.environ.get("OSINT_LATENCY_SAVE_INTERVAL", 60))
+
+# Rolling window: once a histogram holds this many samples all counts are
+# halved, so old behaviour fades out instead of dominating forever.
+WINDOW = int(os.environ.get("OSINT_LATENCY_WINDOW", 500))
+# Samples needed before a host gets an adaptive timeout
+MIN_SAMPLES = int(os.environ.get("OSINT_LATENCY_MIN_SAMPLES", 20))
+
+# Adaptive timeout = p99 * TIMEOUT_FACTOR, clamped to [MIN_TIMEOUT, MAX_TIMEOUT]
+TIMEOUT_FACTOR = float(os.environ.get("OSINT_TIMEOUT_FACTOR", 1.5))
+MIN_TIMEOUT = float(os.environ.get("OSINT_MIN_TIMEOUT", 1.0))
+MAX_TIMEOUT = float(os.environ.get("OSINT_MAX_TIMEOUT", 15.0))
+
+# Log-spaced bucket upper bounds from 25ms to ~60s
+BOUNDS = [round(0.025 * 1.25 ** i, 4) for i in range(36)]
+
+
+class LatencyHistogram:
+    """Bucketed, decaying latency distribution for one host."""
+
+    def __init__(self, counts=None):
+        self.counts = list(counts) if counts and len(counts) == len(BOUNDS) + 1 else [0.0] * (len(BOUNDS) + 1)
+        self.total = sum(self.counts)
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.total += 1
+        if self.total > WINDOW:
+            self.counts = [c / 2 for c in self.counts]
+            self.total /= 2
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile, or None when empty."""
+        if not self.total:
+            return None
+        target = q * self.total
+        running = 0.0
+        for i, c in enumerate(self.counts):
+            running += c
+            if running >= target:
+                return BOUNDS[i] if i < len(BOUNDS) else BOUNDS[-1] * 1.25
+        return BOUNDS[-1]
+
+    def timeout(self, fallback):
+        if self.total < MIN_SAMPLES:
+            return fallback
+        return round(min(MAX_TIMEOUT, max(MIN_TIMEOUT, self.quantile(0.99) * TIMEOUT_FACTOR)), 2)
+
+    def summary(self, fallback):
+        return {
+            "samples": round(self.total, 1),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "timeout": self.timeout(fallback),
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins
+        }
+
+
+# ==========================================
+#  REGISTRY + PERSISTENCE
+# ==========================================
+
+_histograms = {}
+_lock = threading.Lock()
+_loaded = False
+_last_save = time.monotonic()
+
+
+def _load():
+    global _loaded
+    _loaded = True
+    if not LATENCY_FILE:
+        return
+    try:
+        with open(LATENCY_FILE, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return
+    if raw.get("bounds") != BOUNDS:
+        print("[!] Latency histograms use different buckets, starting fresh")
+        return
+    for host, counts in raw.get("hosts", {}).items():
+        _histograms[host] = LatencyHistogram(counts)
+    print(f"[+] Loaded latency histograms for {len(_histograms)} hosts")
+
+
+def histogram(host):
+    with _lock:
+        if not _loaded:
+            _load()
+        h = _histograms.get(host)
+        if h is None:
+            h = _histograms[host] = LatencyHistogram()
+        return h
+
+
+def save():
+    """Writes every histogram to LATENCY_FILE atomically."""
+    global _last_save
+    if not LATENCY_FILE or not _histograms:
+        return
+    with _lock:
+        data = {"bounds": BOUNDS, "hosts": {host: h.counts for host, h in _histograms.items()}}
+        _last_save = time.monotonic()
+    try:
+        directory = os.path.dirname(os.path.abspath(LATENCY_FILE))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, LATENCY_FILE)
+    except OSError as e:
+        print(f"[!] Could not save latency histograms: {e}")
+
+
+def record(host, seconds):
+    h = histogram(host)
+    with _lock:
+        h.record(seconds)
+        due = time.monotonic() - _last_save > SAVE_INTERVAL
+    if due:
+        save()
+
+
+def record_timeout(host):
+    """
+    Counts a request that hit its timeout. It is not a latency sample: the
+    real latency is unknown (censored), and feeding the timeout back into
+    the histogram would only ever ratchet the adaptive timeout upward.
+    """
+    h = histogram(host)
+    with _lock:
+        h.timeouts += 1
+
+
+def timeout_for(host, fallback):
+    """Adaptive timeout for host, or fallback until enough samples exist."""
+    return histogram(host).timeout(fallback)
+
+
+def median(host):
+    """Observed p50 for host, or None before it has been measured (no entry is created)."""
+    with _lock:
+        if not _loaded:
+            _load()
+        h = _histograms.get(host)
+    return h.quantile(0.5) if h is not None and h.total else None
+
+
+def hedge_delay(host, min_p95):
+    """
+    Median latency to wait before sending a hedged duplicate, or None when
+    the host is not chronically slow (p95 under min_p95) or barely observed.
+    """
+    h = histogram(host)
+    if h.total < MIN_SAMPLES or h.quantile(0.95) < min_p95:
+        return None
+    return h.quantile(0.5)
+
+
+def note_hedge(host, won):
+    h = histogram(host)
+    with _lock:
+        h.hedges += 1
+        if won:
+            h.hedge_wins += 1
+
+
+def stats(fallback):
+    with _lock:
+        items = list(_histograms.items())
+    return {host: h.summary(fallback) for host, h in items}
+
+
+atexit.register(save)
@@ -0,0 +1,100 @@
+import os
+import smtplib
+import threading
+
+import dns.resolver
+
+from osint_modules.result_cache import get_cache
+
+# --- CONFIGURATION ---
+# Per-domain MX answers are cached for the record's own DNS TTL, clamped to
+# [MIN_TTL, MAX_TTL]; domains without mail (NXDOMAIN / no MX) for NEGATIVE_TTL.
+MIN_TTL = int(os.environ.get("OSINT_MX_MIN_TTL", 60))
+MAX_TTL = int(os.environ.get("OSINT_MX_MAX_TTL", 24 * 3600))
+NEGATIVE_TTL = int(os.environ.get("OSINT_MX_NEGATIVE_TTL", 900))
+DNS_TIMEOUT = float(os.environ.get("OSINT_MX_DNS_TIMEOUT", 3))
+
+# Banner/reachability is cached per mail server, so every domain hosted on
+# the same MX (Google Workspace, Microsoft 365, ...) shares one connection.
+# Unreachable servers (port 25 is often filtered) are remembered too.
+SMTP_TTL = int(os.environ.get("OSINT_SMTP_TTL", 6 * 3600))
+SMTP_FAIL_TTL = int(os.environ.get("OSINT_SMTP_FAIL_TTL", 1800))
+SMTP_TIMEOUT = float(os.environ.get("OSINT_SMTP_TIMEOUT", 5))
+
+# Lookups running at once, across all scans in the process
+DNS_CONCURRENCY = int(os.environ.get("OSINT_MX_DNS_CONCURRENCY", 16))
+SMTP_CONCURRENCY = int(os.environ.get("OSINT_SMTP_CONCURRENCY", 4))
+
+mx_cache = get_cache("mx", maxsize=int(os.environ.get("OSINT_MX_CACHE_SIZE", 16384)),
+                     disk_dir=False, ttl_for=lambda v: v["ttl"])
+smtp_cache = get_cache("smtp_host", maxsize=int(os.environ.get("OSINT_SMTP_CACHE_SIZE", 4096)), disk_dir=False,
+                       ttl_for=lambda v: SMTP_TTL if v.get("reachable") else SMTP_FAIL_TTL)
+
+_dns_slots = threading.BoundedSemaphore(DNS_CONCURRENCY)
+_smtp_slots = threading.BoundedSemaphore(SMTP_CONCURRENCY)
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def resolver():
+    """Shared dnspython resolver (reads resolv.conf once) with DNS_TIMEOUT overall."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                r = dns.resolver.Resolver()
+                r.lifetime = DNS_TIMEOUT
+                r.timeout = min(r.timeout, DNS_TIMEOUT)
+                _resolver = r
+    return _resolver
+
+
+def normalize_domain(domain):
+    return (domain or "").strip().rstrip(".").lower()
+
+
+def _resolve_mx(domain):
+    try:
+        with _dns_slots:
+            answer = resolver().resolve(domain, "MX")
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.NoNameservers) as e:
+        return {"domain": domain, "mx": [], "ttl": NEGATIVE_TTL, "error": type(e).__name__}
+    # Timeouts and other failures propagate: nothing is cached and the next caller retries
+    records = sorted(({"host": str(r.exchange).rstrip("."), "preference": r.preference} for r in answer),
+                     key=lambda r: (r["preference"], r["host"]))
+    # A null MX (RFC 7505, ".") means the domain accepts no mail
+    records = [r for r in records if r["host"]]
+    ttl = min(MAX_TTL, max(MIN_TTL, answer.rrset.ttl))
+    return {"domain": domain, "mx": records, "ttl": ttl}
+
+
+def mx_lookup(domain):
+    """{"domain", "mx": [{"host", "preference"}] best first, "ttl"}, cached per domain."""
+    domain = normalize_domain(domain)
+    return mx_cache.get_or_load(domain, lambda: _resolve_mx(domain))
+
+
+def _probe_smtp(host):
+    try:
+        with _smtp_slots:
+            server = smtplib.SMTP(timeout=SMTP_TIMEOUT)
+            try:
+                # The greeting is the banner; no EHLO/NOOP round trips needed
+                code, msg = server.connect(host, 25)
+            finally:
+                server.close()
+        return {"host": host, "reachable": 200 <= code < 400, "code": code,
+                "banner": msg.decode("utf-8", errors="ignore")}
+    except (OSError, smtplib.SMTPException) as e:
+        return {"host": host, "reachable": False, "error": str(e) or type(e).__name__}
+
+
+def smtp_probe(host):
+    """Banner and reachability of a mail server on port 25, cached per host."""
+    host = normalize_domain(host)
+    return smtp_cache.get_or_load(host, lambda: _probe_smtp(host))
+
+
+def stats():
+    return {"mx": mx_cache.stats(), "smtp_host": smtp_cache.stats(),
+            "dns_concurrency": DNS_CONCURRENCY, "smtp_concurrency": SMTP_CONCURRENCY}
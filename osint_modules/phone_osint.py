@@ -1,10 +1,73 @@
+import itertools
+import os
+import time
+
 import phonenumbers
 from phonenumbers import carrier, geocoder, timezone
+from phonenumbers.carrierdata import CARRIER_DATA, CARRIER_LONGEST_PREFIX
+from phonenumbers.geodata import GEOCODE_DATA, GEOCODE_LONGEST_PREFIX
+from phonenumbers.tzdata import TIMEZONE_DATA, TIMEZONE_LONGEST_PREFIX
+
+from osint_modules.result_cache import get_cache
+
+# --- CONFIGURATION ---
+# Region, carrier and time zones depend only on the number type, its
+# region and which entries of phonenumbers' prefix tables the number
+# falls under, so they are cached per prefix instead of looked up per number.
+prefix_cache = get_cache("phone_prefix", maxsize=int(os.environ.get("OSINT_PHONE_PREFIX_CACHE", 65536)),
+                         hit_ttl=7 * 86400, miss_ttl=7 * 86400, disk_dir=False, is_miss=lambda v: False)
+# Batches are looked up a chunk at a time in sorted order: numbers from the
+# same country then reuse phonenumbers' compiled patterns, which thrash the
+# re module's cache when countries are interleaved
+BATCH_CHUNK = int(os.environ.get("OSINT_PHONE_BATCH_CHUNK", 2000))
+
+LINE_TYPES = {
+    phonenumbers.PhoneNumberType.MOBILE: "Mobile / Cellular",
+    phonenumbers.PhoneNumberType.FIXED_LINE: "Landline",
+    phonenumbers.PhoneNumberType.VOIP: "VoIP (Virtual)",
+    phonenumbers.PhoneNumberType.TOLL_FREE: "Toll-Free",
+}
+
+
+def _matched_prefix(data, longest, digits, lang=None):
+    """Longest leading-digit key of data that applies to digits (as phonenumbers searches it)."""
+    for length in range(min(longest, len(digits)), 0, -1):
+        entry = data.get(digits[:length])
+        if entry is not None and (lang is None or lang in entry):
+            return digits[:length]
+    return ""
+
+def prefix_key(parsed, e164, num_type):
+    digits = e164[1:]
+    if phonenumbers.country_mobile_token(parsed.country_code):
+        # Geocoding strips a mobile token first (e.g. Argentina), so key on every digit the tables could use
+        return f"{num_type}:{digits[:max(GEOCODE_LONGEST_PREFIX, CARRIER_LONGEST_PREFIX, TIMEZONE_LONGEST_PREFIX)]}"
+    geo = _matched_prefix(GEOCODE_DATA, GEOCODE_LONGEST_PREFIX, digits, "en")
+    if not geo and len(phonenumbers.region_codes_for_country_code(parsed.country_code)) > 1:
+        # The fallback country name depends on which of the regions sharing
+        # the calling code the whole number is valid for
+        geo = "#" + digits
+    return ":".join((str(num_type), phonenumbers.region_code_for_number(parsed) or "", geo,
+                     _matched_prefix(CARRIER_DATA, CARRIER_LONGEST_PREFIX, digits, "en"),
+                     _matched_prefix(TIMEZONE_DATA, TIMEZONE_LONGEST_PREFIX, digits)))
+
+def prefix_metadata(parsed, e164, num_type):
+    """[country, carrier, time zones] for the number's prefix, cached."""
+    key = prefix_key(parsed, e164, num_type)
+
+    def load():
+        # Lists, not tuples: the cache keeps JSON-shaped values
+        return [geocoder.description_for_number(parsed, "en"),
+                carrier.name_for_number(parsed, "en"),
+                ", ".join(timezone.time_zones_for_number(parsed))]
+    return prefix_cache.get_or_load(key, load)
 
-def phone_lookup(number):
+
+def phone_lookup(number, region=None):
     """
     Scans a phone number using the python-phonenumbers library.
-    Expects number in international format (e.g., "+919876543210").
+    Expects number in international format (e.g., "+919876543210"), or a
+    national number when region (e.g. "IN") is given.
     """
     if not number or len(number) < 5:
         return {"valid": False, "error": "Number too short or empty"}
@@ -12,33 +75,23 @@ def phone_lookup(number):
     try:
         # 1. Parse the number
         # The frontend now sends "+91..." so we use None for region as it's implied in the string
-        parsed = phonenumbers.parse(number, None)
+        parsed = phonenumbers.parse(number, region)
 
         if not phonenumbers.is_valid_number(parsed):
             return {"valid": False, "error": "Invalid Number Pattern"}
 
-        # 2. Extract Basic Technical Details
-        country = geocoder.description_for_number(parsed, "en")
-        carrier_name = carrier.name_for_number(parsed, "en")
-        time_zones = timezone.time_zones_for_number(parsed)
-        
-        # 3. Determine Line Type (Mobile, Landline, VoIP)
+        # 2. Determine Line Type (Mobile, Landline, VoIP)
         num_type = phonenumbers.number_type(parsed)
-        line_type_str = "Unknown"
-        if num_type == phonenumbers.PhoneNumberType.MOBILE: 
-            line_type_str = "Mobile / Cellular"
-        elif num_type == phonenumbers.PhoneNumberType.FIXED_LINE: 
-            line_type_str = "Landline"
-        elif num_type == phonenumbers.PhoneNumberType.VOIP: 
-            line_type_str = "VoIP (Virtual)"
-        elif num_type == phonenumbers.PhoneNumberType.TOLL_FREE: 
-            line_type_str = "Toll-Free"
-
-        # 4. Formats
+        line_type_str = LINE_TYPES.get(num_type, "Unknown")
+
+        # 3. Formats
         e164 = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
         national = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL)
         clean_number = e164.replace('+', '')
 
+        # 4. Extract Basic Technical Details (shared by every number with this prefix)
+        country, carrier_name, time_zones = prefix_metadata(parsed, e164, num_type)
+
         # 5. Generate Search Dorks (Web Footprint)
         dorks = {
             "Google Search": f"https://www.google.com/search?q=\"{e164}\" OR \"{national}\"",
@@ -54,7 +107,7 @@ def phone_lookup(number):
                 "country": country if country else "Unknown Region",
                 "carrier": carrier_name if carrier_name else "Unknown Carrier",
                 "line_type": line_type_str,
-                "time_zone": ", ".join(time_zones),
+                "time_zone": time_zones,
                 "format_e164": e164,
                 "format_national": national
             },
@@ -73,4 +126,35 @@ def phone_lookup(number):
         return {
             "valid": False,
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+
+def phone_lookup_many(numbers, region=None, stats=None):
+    """
+    Yields (number, phone_lookup result) for every input in order, one
+    BATCH_CHUNK at a time. Repeats within a chunk are looked up once; only
+    the current chunk's results are held, since a repeat in a later chunk
+    is cheap to redo through the prefix cache. stats, if given, is kept up
+    to date as the batch runs: count, valid, invalid, duplicates, seconds,
+    numbers_per_sec.
+    """
+    stats = {} if stats is None else stats
+    stats.update(count=0, valid=0, invalid=0, duplicates=0, seconds=0.0, numbers_per_sec=None)
+    seen = set()
+    start = time.perf_counter()
+    numbers = iter(numbers)
+    while True:
+        chunk = list(itertools.islice(numbers, BATCH_CHUNK))
+        if not chunk:
+            break
+        results = {number: phone_lookup(number, region) for number in sorted(set(chunk))}
+        for number in chunk:
+            result = results[number]
+            stats["count"] += 1
+            stats["valid" if result.get("valid") else "invalid"] += 1
+            yield number, result
+        seen.update(results)
+        stats["duplicates"] = stats["count"] - len(seen)
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        if stats["seconds"]:
+            stats["numbers_per_sec"] = round(stats["count"] / stats["seconds"])
@@ -0,0 +1,120 @@
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+from helpers.case_manager import iter_investigations
+from osint_modules import latency
+
+# --- CONFIGURATION ---
+# Assumed probe latency (seconds) for hosts without a measured median yet
+DEFAULT_LATENCY = float(os.environ.get("OSINT_PRIORITY_DEFAULT_LATENCY", 1.0))
+
+
+class PlatformPriority:
+    """
+    Historical hit rates per platform, learned once from the case store's
+    past investigations and updated after every scan. Platforms are ordered by expected
+    value: smoothed hit rate divided by the host's median latency, so
+    high-yield, fast platforms take the first probe slots.
+    The case store is read in a background thread; until it is done scans
+    are ordered by the priors gathered so far (latency and recent scans).
+    """
+
+    def __init__(self):
+        self.hits = Counter()
+        # Full scans probe every platform; partial (quick) scans and probes
+        # without an answer are tracked per platform instead.
+        self.full_scans = 0
+        self.partial_scans = Counter()
+        self.unresolved = Counter()
+        self._started = False
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def _learn(self, started_at):
+        # Counted apart from self and merged at the end, so scans never wait on the walk
+        learned = PlatformPriority()
+        count = 0
+        try:
+            for data in iter_investigations():
+                if not isinstance(data, dict) or not data.get("username_results"):
+                    continue
+                # Scans since learning began were already counted by record_scan
+                if _scanned_at(data) >= started_at:
+                    continue
+                probed = data.get("probed_platforms")
+                # Partial and incremental scans also carry hits they did not probe
+                found = [name for name, r in data["username_results"].items()
+                         if isinstance(r, dict) and r.get("found") and r.get("category") != "Archive"
+                         and (probed is None or name in probed)]
+                learned._record(found, probed, (data.get("probe_status") or {}).keys())
+                count += 1
+        except Exception as e:
+            print(f"[!] Platform priority could not read past investigations: {e}")
+        with self._lock:
+            self.hits.update(learned.hits)
+            self.full_scans += learned.full_scans
+            self.partial_scans.update(learned.partial_scans)
+            self.unresolved.update(learned.unresolved)
+        self.ready.set()
+        if count:
+            print(f"[+] Platform priority learned from {count} past investigations")
+
+    def _record(self, found, probed, unresolved):
+        self.hits.update(found)
+        if probed is None:
+            self.full_scans += 1
+        else:
+            self.partial_scans.update(probed)
+        self.unresolved.update(unresolved)
+
+    def _ensure_loaded(self):
+        if not self._started:
+            with self._lock:
+                if self._started:
+                    return
+                self._started = True
+            threading.Thread(target=self._learn, args=(datetime.now(timezone.utc),),
+                             name="priority-learn", daemon=True).start()
+
+    def record_scan(self, found, probed=None, unresolved=()):
+        """found: platform names hit; probed: names tried (None = all); unresolved: throttled/timed out."""
+        self._ensure_loaded()
+        with self._lock:
+            self._record(found, probed, unresolved)
+
+    def hit_rate(self, name):
+        scans = self.full_scans + self.partial_scans[name] - self.unresolved[name]
+        # Laplace smoothing keeps unseen platforms near 50% instead of 0
+        return (self.hits[name] + 1) / (max(scans, 0) + 2)
+
+    def expected_value(self, p):
+        return self.hit_rate(p.name) / (latency.median(p.host) or DEFAULT_LATENCY)
+
+    def order(self, platforms):
+        """platforms sorted by expected value, best first (stable for ties)."""
+        self._ensure_loaded()
+        return sorted(platforms, key=self.expected_value, reverse=True)
+
+    def stats(self, platforms):
+        self._ensure_loaded()
+        return {
+            "ready": self.ready.is_set(),
+            "full_scans": self.full_scans,
+            "order": [{"platform": p.name, "hit_rate": round(self.hit_rate(p.name), 3),
+                       "median_latency": latency.median(p.host),
+                       "expected_value": round(self.expected_value(p), 3)}
+                      for p in self.order(platforms)]
+        }
+
+
+def _scanned_at(data):
+    try:
+        scanned = datetime.fromisoformat(str(data.get("timestamp")).replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return scanned if scanned.tzinfo else scanned.replace(tzinfo=timezone.utc)
+
+
+priority = PlatformPriority()
@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+# --- CONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PLATFORMS_FILE = os.path.join(BASE_DIR, 'platforms.json')
+# How often (seconds) the file's mtime is re-checked for hot reload
+RELOAD_CHECK_INTERVAL = float(os.environ.get("OSINT_PLATFORMS_RELOAD_INTERVAL", 2))
+
+CHECK_TYPES = ("status_code", "string_match", "metadata")
+PROBE_MODES = ("get", "head", "range", "stream")
+
+
+class PlatformError(ValueError):
+    pass
+
+
+class Platform:
+    """
+    One validated platforms.json entry. The URL template is split around
+    its "{}" once at load time, so building a probe URL is a concatenation.
+    """
+
+    __slots__ = ("name", "url", "category", "breach", "check_type", "error_msg",
+                 "probe", "max_bytes", "host", "_prefix", "_suffix")
+
+    def __init__(self, name, url, category, breach=False, check_type="status_code",
+                 error_msg=None, probe="get", max_bytes=None):
+        self.name = name
+        self.url = url
+        self.category = category
+        self.breach = breach
+        self.check_type = check_type
+        self.error_msg = error_msg
+        self.probe = probe
+        self.max_bytes = max_bytes
+        self._prefix, self._suffix = url.split("{}", 1)
+        self.host = (urlsplit(self._prefix + "x" + self._suffix).hostname or "").lower()
+
+    def url_for(self, username):
+        return self._prefix + username + self._suffix
+
+    def to_dict(self):
+        data = {"name": self.name, "url": self.url, "category": self.category, "breach": self.breach,
+                "check_type": self.check_type, "probe": self.probe}
+        if self.error_msg is not None:
+            data["error_msg"] = self.error_msg
+        if self.max_bytes is not None:
+            data["max_bytes"] = self.max_bytes
+        return data
+
+    def __repr__(self):
+        return f"Platform({self.name!r})"
+
+
+def compile_platform(entry):
+    """Validates one raw entry against the platforms.json schema and builds a Platform."""
+    if not isinstance(entry, dict):
+        raise PlatformError("entry is not an object")
+
+    name = entry.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise PlatformError("missing 'name'")
+    url = entry.get("url")
+    if not isinstance(url, str) or url.count("{}") != 1 or not url.startswith(("http://", "https://")):
+        raise PlatformError(f"{name}: 'url' must be an http(s) URL with exactly one '{{}}'")
+    category = entry.get("category")
+    if not isinstance(category, str) or not category:
+        raise PlatformError(f"{name}: missing 'category'")
+
+    check_type = entry.get("check_type", "status_code")
+    if check_type not in CHECK_TYPES:
+        raise PlatformError(f"{name}: unknown check_type '{check_type}'")
+    error_msg = entry.get("error_msg")
+    if check_type == "string_match" and (not isinstance(error_msg, str) or not error_msg):
+        raise PlatformError(f"{name}: string_match needs a non-empty 'error_msg'")
+
+    probe = entry.get("probe", "get")
+    if probe not in PROBE_MODES:
+        raise PlatformError(f"{name}: unknown probe mode '{probe}'")
+    max_bytes = entry.get("max_bytes")
+    if max_bytes is not None and (not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes <= 0):
+        raise PlatformError(f"{name}: 'max_bytes' must be a positive integer")
+
+    breach = entry.get("breach", False)
+    if not isinstance(breach, bool):
+        raise PlatformError(f"{name}: 'breach' must be true/false")
+
+    return Platform(name.strip(), url, category, breach, check_type, error_msg, probe, max_bytes)
+
+
+class PlatformRegistry:
+    """
+    platforms.json compiled once into Platform objects and swapped in
+    atomically whenever the file's mtime changes. Invalid entries are
+    skipped and reported in `errors` instead of failing silently.
+    """
+
+    def __init__(self, path=PLATFORMS_FILE):
+        self.path = path
+        self._platforms = ()
+        self._by_name = {}
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self.errors = []
+        self.loaded_at = None
+
+    def _load(self, mtime):
+        with open(self.path, 'r', encoding="utf-8") as f:
+            raw = json.load(f)
+        if not isinstance(raw, list):
+            raise PlatformError("platforms.json must contain a list")
+
+        platforms = []
+        by_name = {}
+        errors = []
+        for i, entry in enumerate(raw):
+            try:
+                p = compile_platform(entry)
+            except PlatformError as e:
+                errors.append(f"entry {i}: {e}")
+                continue
+            if p.name in by_name:
+                errors.append(f"entry {i}: duplicate platform '{p.name}' ignored")
+                continue
+            by_name[p.name] = p
+            platforms.append(p)
+
+        for err in errors:
+            print(f"[!] platforms.json {err}")
+
+        # Swap everything in one go so readers never see a half-built list
+        self._platforms, self._by_name, self.errors = tuple(platforms), by_name, errors
+        self._mtime = mtime
+        self.loaded_at = time.time()
+        print(f"[+] Platform registry loaded: {len(platforms)} platforms")
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._mtime is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        with self._lock:
+            if self._mtime is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                if self._mtime is None:
+                    print(f"[!] platforms.json unavailable: {e}")
+                return
+            if mtime == self._mtime:
+                return
+            try:
+                self._load(mtime)
+            except (OSError, ValueError) as e:
+                # Keep serving the last good registry on a bad edit
+                print(f"[!] platforms.json reload failed, keeping previous list: {e}")
+                self._mtime = mtime
+
+    def platforms(self):
+        self._refresh()
+        return self._platforms
+
+    def get(self, name):
+        self._refresh()
+        return self._by_name.get(name)
+
+    def stats(self):
+        self._refresh()
+        return {
+            "path": self.path,
+            "count": len(self._platforms),
+            "loaded_at": self.loaded_at,
+            "errors": list(self.errors)
+        }
+
+
+registry = PlatformRegistry()
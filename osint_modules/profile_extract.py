@@ -1,13 +1,11 @@
-import requests
 from bs4 import BeautifulSoup
+from osint_modules import http_client
+from osint_modules.result_cache import cached
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (OSINT Platform)"
-}
-
+@cached("github_profile", key=lambda username: username.strip().lower())
 def extract_github_profile(username):
     url = f"https://github.com/{username}"
-    r = requests.get(url, headers=HEADERS, timeout=10)
+    r = http_client.get(url, fallback_timeout=10)
 
     if r.status_code != 200:
         return None
@@ -0,0 +1,109 @@
+import os
+import time
+from datetime import datetime, timezone
+
+# --- CONFIGURATION ---
+# How long (seconds) a platform's last answer stays fresh for an incremental
+# re-scan, per category. Override with e.g. OSINT_FRESHNESS="Social=1800,Tech=43200".
+FRESHNESS = {
+    "Social": 6 * 3600,
+    "Messaging": 6 * 3600,
+    "Video": 12 * 3600,
+    "Contact": 12 * 3600,
+    "Archive": 7 * 86400,
+}
+DEFAULT_FRESHNESS = int(os.environ.get("OSINT_FRESHNESS_DEFAULT", 24 * 3600))
+
+for _item in filter(None, os.environ.get("OSINT_FRESHNESS", "").split(",")):
+    _category, _, _seconds = _item.partition("=")
+    try:
+        FRESHNESS[_category.strip()] = int(_seconds)
+    except ValueError:
+        print(f"[!] Ignoring bad OSINT_FRESHNESS entry '{_item}'")
+
+# Fields compared to decide whether a profile that is still there has changed
+DIFF_FIELDS = ("url", "avatar")
+DIFF_METADATA = ("title", "bio", "secrets", "created_at")
+
+
+def window(category):
+    return FRESHNESS.get(category, DEFAULT_FRESHNESS)
+
+
+def iso(epoch=None):
+    return datetime.fromtimestamp(time.time() if epoch is None else epoch, timezone.utc).isoformat()
+
+
+def _epoch(iso):
+    try:
+        return datetime.fromisoformat(str(iso).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def checked_times(prior, names):
+    """
+    {platform: epoch seconds} of each platform's last real answer in prior.
+    Investigations saved before platform_checked_at existed fall back to
+    the scan timestamp for every probed platform that did not error out.
+    """
+    if prior.get("platform_checked_at"):
+        return {name: t for name, t in ((n, _epoch(iso)) for n, iso in prior["platform_checked_at"].items())
+                if t is not None}
+    scanned_at = _epoch(prior.get("timestamp"))
+    if scanned_at is None:
+        return {}
+    probed = prior.get("probed_platforms")
+    unresolved = prior.get("probe_status") or {}
+    return {name: scanned_at for name in (names if probed is None else probed) if name not in unresolved}
+
+
+def is_fresh(checked_at, category, now=None):
+    """checked_at: epoch seconds of the last real answer, None if there was none."""
+    return checked_at is not None and (now or time.time()) - checked_at <= window(category)
+
+
+def plan(platforms, checked, now=None):
+    """
+    Splits platforms into those to re-probe (never answered, errored or
+    throttled last time, or older than their category's freshness window)
+    and {name: checked_at} for those whose previous answer can be reused.
+    """
+    now = now or time.time()
+    stale, fresh = [], {}
+    for p in platforms:
+        if is_fresh(checked.get(p.name), p.category, now):
+            fresh[p.name] = checked[p.name]
+        else:
+            stale.append(p)
+    return stale, fresh
+
+
+def _fingerprint(r):
+    meta = r.get("metadata") or {}
+    return {**{k: r.get(k) for k in DIFF_FIELDS}, **{k: meta.get(k) for k in DIFF_METADATA}}
+
+
+def diff(prior_results, results, unresolved=()):
+    """
+    What changed between two username_results maps: profiles that appeared,
+    disappeared (confirmed misses only) or whose URL/avatar/bio changed.
+    Earlier hits whose re-probe got no answer are listed as unverified.
+    """
+    def found(data):
+        return {k: v for k, v in (data or {}).items() if isinstance(v, dict) and v.get("found")}
+
+    before, after = found(prior_results), found(results)
+    unresolved = set(unresolved)
+    changed = []
+    for name in sorted(before.keys() & after.keys()):
+        old, new = _fingerprint(before[name]), _fingerprint(after[name])
+        fields = [k for k in old if old[k] != new[k]]
+        if fields:
+            changed.append({"platform": name, "fields": fields})
+    return {
+        "appeared": sorted(after.keys() - before.keys()),
+        "disappeared": sorted(before.keys() - after.keys() - unresolved),
+        "unverified": sorted(before.keys() & unresolved),
+        "changed": changed
+    }
@@ -0,0 +1,251 @@
+import copy
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# --- CONFIGURATION ---
+# Hits stay valid for hours; misses expire sooner so new accounts show up.
+HIT_TTL = int(os.environ.get("OSINT_CACHE_HIT_TTL", 6 * 3600))
+MISS_TTL = int(os.environ.get("OSINT_CACHE_MISS_TTL", 30 * 60))
+MAX_ENTRIES = int(os.environ.get("OSINT_CACHE_SIZE", 4096))
+# Optional on-disk tier shared across restarts (disabled when unset)
+DISK_DIR = os.environ.get("OSINT_CACHE_DIR")
+
+# Returned by TTLCache.get when nothing is cached (None is a valid cached miss)
+MISSING = object()
+# A full cache drops its expired entries at most this often before evicting live ones
+SWEEP_INTERVAL = 60
+
+
+def default_is_miss(value):
+    """None/empty results and {"found": False} style payloads count as misses."""
+    if not value:
+        return True
+    return isinstance(value, dict) and value.get("found") is False
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Size-bounded LRU with separate TTLs for hits and misses and an
+    optional JSON-file disk tier (disk_dir=False opts out of OSINT_CACHE_DIR).
+    ttl_for(value), when given, picks each entry's TTL instead (e.g. from DNS).
+    Values must be JSON serialisable.
+    Callers get their own copy, so mutating a result never poisons the cache.
+    """
+
+    def __init__(self, name, maxsize=None, hit_ttl=None, miss_ttl=None, disk_dir=None, is_miss=default_is_miss,
+                 ttl_for=None):
+        self.name = name
+        self.maxsize = maxsize or MAX_ENTRIES
+        self.hit_ttl = HIT_TTL if hit_ttl is None else hit_ttl
+        self.miss_ttl = MISS_TTL if miss_ttl is None else miss_ttl
+        self.is_miss = is_miss
+        self.ttl_for = ttl_for
+        self.disk_dir = None
+        if disk_dir is None:
+            disk_dir = DISK_DIR
+        if disk_dir:
+            self.disk_dir = os.path.join(disk_dir, name)
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+        self._data = OrderedDict()
+        self._next_sweep = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "shared": 0, "disk_hits": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    # --- disk tier ---
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def _disk_get(self, key):
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key or entry.get("expires", 0) <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def _disk_set(self, key, expires, value):
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "expires": expires, "value": value}, f, default=str)
+            os.replace(tmp, self._disk_path(key))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[!] Cache '{self.name}' disk write failed: {e}")
+
+    # --- public API ---
+    def get(self, key, default=MISSING):
+        """Returns the cached value, or default (MISSING) when absent or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._data.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return copy.deepcopy(entry[1])
+                del self._data[key]
+                self.counters["expired"] += 1
+
+        if self.disk_dir:
+            disk_entry = self._disk_get(key)
+            if disk_entry is not None:
+                with self._lock:
+                    self._store(key, disk_entry["expires"], disk_entry["value"])
+                    self.counters["hits"] += 1
+                    self.counters["disk_hits"] += 1
+                return copy.deepcopy(disk_entry["value"])
+
+        with self._lock:
+            self.counters["misses"] += 1
+        return default
+
+    def _store(self, key, expires, value):
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        now = time.time()
+        if len(self._data) > self.maxsize and now >= self._next_sweep:
+            self._next_sweep = now + SWEEP_INTERVAL
+            for k in [k for k, e in self._data.items() if e[0] <= now]:
+                del self._data[k]
+                self.counters["expired"] += 1
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def set(self, key, value):
+        if self.ttl_for is not None:
+            ttl = self.ttl_for(value)
+        else:
+            ttl = self.miss_ttl if self.is_miss(value) else self.hit_ttl
+        if ttl <= 0:
+            return
+        expires = time.time() + ttl
+        with self._lock:
+            self._store(key, expires, copy.deepcopy(value))
+            self.counters["stores"] += 1
+        if self.disk_dir:
+            self._disk_set(key, expires, value)
+
+    def get_or_load(self, key, loader):
+        """
+        Cached value for key, or loader() stored under key. Concurrent callers
+        asking for the same missing key share one in-flight load (single
+        flight), so overlapping scans never repeat the same lookup.
+        Exceptions from loader propagate to every waiter and nothing is cached.
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.counters["shared"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.value)
+
+        try:
+            flight.value = loader()
+            self.set(key, flight.value)
+            return copy.deepcopy(flight.value)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def discard(self, key):
+        """Drops key from memory (the disk tier keeps it until it expires)."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hit_ttl": self.hit_ttl,
+                "miss_ttl": self.miss_ttl,
+                "disk": bool(self.disk_dir),
+                "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else None,
+                **self.counters
+            }
+
+
+# ==========================================
+#  REGISTRY
+# ==========================================
+
+_caches = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name, **kwargs):
+    """Returns the process-wide cache called name, creating it on first use."""
+    with _registry_lock:
+        if name not in _caches:
+            _caches[name] = TTLCache(name, **kwargs)
+        return _caches[name]
+
+
+def cache_stats():
+    return {name: c.stats() for name, c in list(_caches.items())}
+
+
+def cached(name, key, default=None, **cache_kwargs):
+    """
+    Decorator: memoises fn in cache `name` under key(*args), sharing
+    in-flight calls for the same key across threads. If fn raises (timeout,
+    connection error) default is returned and nothing is cached, so transient failures are retried on the next scan.
+    """
+    def decorator(fn):
+        cache = get_cache(name, **cache_kwargs)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return cache.get_or_load(key(*args, **kwargs), lambda: fn(*args, **kwargs))
+            except Exception:
+                return default
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,182 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from collections import deque
+
+# --- CONFIGURATION ---
+# Global cap on in-flight probes, and a per-host cap so a single site
+# never receives more than a handful of simultaneous requests.
+GLOBAL_LIMIT = int(os.environ.get("OSINT_SCAN_GLOBAL_LIMIT", 200))
+PER_HOST_LIMIT = int(os.environ.get("OSINT_SCAN_PER_HOST_LIMIT", 4))
+
+# Passed to on_result for probes skipped because the scan was cancelled,
+# so callers can tell them apart from a probe that found nothing (None)
+SKIPPED = object()
+
+_shared_executor = None
+_executor_lock = threading.Lock()
+_host_limiters = {}
+
+
+def shared_executor():
+    """
+    Process-wide probe pool. Every scan (single, background or bulk) draws
+    from it, so GLOBAL_LIMIT caps in-flight probes across all targets.
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        with _executor_lock:
+            if _shared_executor is None:
+                _shared_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=GLOBAL_LIMIT, thread_name_prefix="osint-probe")
+    return _shared_executor
+
+
+class HostLimiter:
+    """
+    Per-host probe slots shared by every scan in the process. Each scan runs
+    its own event loop, so waiters are asyncio futures woken thread-safely
+    on their own loop, and a released slot is handed straight to the next
+    waiter for that host (first come, first served).
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._active = {}
+        self._waiters = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, host):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._active.get(host, 0) < self.limit:
+                self._active[host] = self._active.get(host, 0) + 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.setdefault(host, deque()).append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                queue = self._waiters.get(host)
+                if queue and waiter in queue:
+                    queue.remove(waiter)
+                    raise
+            # The slot was handed over just as we were cancelled: pass it on
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release(host)
+            raise
+
+    def release(self, host):
+        while True:
+            with self._lock:
+                queue = self._waiters.get(host)
+                if not queue:
+                    self._waiters.pop(host, None)
+                    self._active[host] -= 1
+                    if not self._active[host]:
+                        del self._active[host]
+                    return
+                loop, future = queue.popleft()
+            try:
+                loop.call_soon_threadsafe(self._wake, future, host)
+                return
+            except RuntimeError:
+                # That scan's loop has closed; try the next waiter
+                continue
+
+    def _wake(self, future, host):
+        if future.cancelled():
+            self.release(host)
+        else:
+            future.set_result(None)
+
+    def stats(self):
+        with self._lock:
+            return {"limit": self.limit, "busy_hosts": len(self._active),
+                    "waiting": sum(len(q) for q in self._waiters.values())}
+
+
+def host_limiter(limit=None):
+    """The process-wide HostLimiter for a per-host limit (PER_HOST_LIMIT by default)."""
+    limit = max(1, limit or PER_HOST_LIMIT)
+    with _executor_lock:
+        return _host_limiters.setdefault(limit, HostLimiter(limit))
+
+
+class ScanEngine:
+    """
+    Asyncio fan-out for platform probes (registry Platform objects).
+    The probe itself is a blocking callable (requests based), so each one is
+    dispatched to a worker thread while asyncio enforces the global limit.
+    The per-host limit is process-wide (host_limiter), so concurrent scans
+    of different targets share it. A scan is bounded by the slowest
+    platform, not pool size.
+    """
+
+    def __init__(self, global_limit=None, per_host_limit=None):
+        self.global_limit = max(1, global_limit or GLOBAL_LIMIT)
+        self.per_host_limit = max(1, per_host_limit or PER_HOST_LIMIT)
+
+    async def scan(self, platforms, username, probe, on_result=None, cancel_event=None, deadline=None):
+        """
+        Runs probe(platform, username) for every platform.
+        on_result(platform, result) is called as each probe finishes.
+        Probes not yet started are skipped once cancel_event is set (their
+        result is SKIPPED), and anything unfinished at deadline
+        (time.monotonic()) is abandoned without an on_result call.
+        Returns the list of non-empty results in completion order.
+        """
+        global_sem = asyncio.Semaphore(self.global_limit)
+        limiter = host_limiter(self.per_host_limit)
+        results = []
+        executor = shared_executor()
+
+        async def run_one(p):
+            host = p.host
+            # Host slot first: tasks queued behind a busy host must not sit
+            # on global slots that probes for other hosts could use
+            await limiter.acquire(host)
+            release = True
+            try:
+                async with global_sem:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return p, SKIPPED
+                    future = executor.submit(probe, p, username)
+                    try:
+                        return p, await asyncio.wrap_future(future)
+                    except asyncio.CancelledError:
+                        # Abandoned at the deadline: a probe already running
+                        # keeps its host slot until its request finishes
+                        release = False
+                        future.add_done_callback(lambda _: limiter.release(host))
+                        raise
+                    except Exception as e:
+                        print(f"[!] Probe failed for {p.name}: {e}")
+                        return p, None
+            finally:
+                if release:
+                    limiter.release(host)
+
+        tasks = [asyncio.ensure_future(run_one(p)) for p in platforms]
+        timeout = None if deadline is None else max(0, deadline - time.monotonic())
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=timeout):
+                p, res = await next_done
+                if on_result:
+                    on_result(p, res)
+                if res and res is not SKIPPED:
+                    results.append(res)
+        except asyncio.TimeoutError:
+            pending = [t for t in tasks if not t.done()]
+            print(f"[!] Scan deadline reached, abandoning {len(pending)} probes")
+            for t in pending:
+                t.cancel()
+
+        return results
+
+    def run(self, platforms, username, probe, on_result=None, cancel_event=None, deadline=None):
+        """Sync wrapper so Flask views and CLI code can call the engine directly."""
+        return asyncio.run(self.scan(platforms, username, probe, on_result, cancel_event, deadline))
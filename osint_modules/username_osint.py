@@ -1,31 +1,56 @@
-import requests
 import json
 import os
 import re
 import hashlib
+import time
 import concurrent.futures
-from bs4 import BeautifulSoup
-try:
-    import gender_guesser.detector as gender
-except ImportError:
-    gender = None
 
+if not __package__:
+    # Run as a script (python osint_modules/username_osint.py): make the package importable
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from osint_modules import demographics, host_guard, http_client, rescan
+from osint_modules.email_osint import gravatar_exists
+from osint_modules.host_guard import ThrottledError
+from osint_modules.html_meta import full_soup, iter_text, parse_head, read_head, read_rest, stream_find
+from osint_modules.result_cache import HIT_TTL, MISS_TTL, cached, default_is_miss, get_cache
+from osint_modules.platform_priority import priority
+from osint_modules.platform_registry import registry
+from osint_modules.scan_engine import ScanEngine, SKIPPED
 
-# --- CONFIGURATION ---
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PLATFORMS_FILE = os.path.join(BASE_DIR, 'platforms.json')
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-    "Accept-Language": "en-US,en;q=0.9"
-}
+# --- CONFIGURATION ---
+# (platform, normalized username) -> probe result; None is a cached miss.
+# Inconclusive probes (a probe_status() result) are not cached at all.
+platform_cache = get_cache("platform", ttl_for=lambda r: 0 if isinstance(r, dict) and r.get("state")
+                           else MISS_TTL if default_is_miss(r) else HIT_TTL)
+
+# Body-avoiding probe modes ("probe" in platforms.json): get (default),
+# head, range and stream. range/stream read at most max_bytes of the body.
+PROBE_MAX_BYTES = int(os.environ.get("OSINT_PROBE_MAX_BYTES", 64 * 1024))
+
+# Deferred Wayback fallback: its own small pool and a time budget
+WAYBACK_CONCURRENCY = int(os.environ.get("OSINT_WAYBACK_CONCURRENCY", 4))
+WAYBACK_BUDGET = float(os.environ.get("OSINT_WAYBACK_BUDGET", 8))
+
+# Gravatar pivot: the email guesses are checked together within their own
+# budget, and the pivot is skipped when less than GRAVATAR_MIN_TIME seconds
+# remain before the scan deadline, so it never costs the hits already found
+GRAVATAR_BUDGET = float(os.environ.get("OSINT_GRAVATAR_BUDGET", 4))
+GRAVATAR_MIN_TIME = float(os.environ.get("OSINT_GRAVATAR_MIN_TIME", 1))
+
+# probe_status states for platforms still running when a scan deadline
+# passed, and for those never probed because the scan was cancelled
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+# probe_status state for a range probe whose capped body ended before the
+# "not found" marker could be ruled out
+INCONCLUSIVE = "inconclusive"
 
 def load_platforms():
-    try:
-        with open(PLATFORMS_FILE, 'r', encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return []
+    """Compiled Platform objects from the hot-reloading registry."""
+    return registry.platforms()
 
 # ==========================================
 #  SECTION 1: GENERATORS (Alts & Leetspeak)
@@ -61,81 +86,134 @@ def get_all_variations(username):
 # ==========================================
 
 def predict_demographics(real_name):
-    if not real_name or gender is None:
-        return "Unknown"
-    d = gender.Detector()
-
-    first_name = real_name.split()[0]
-    guess = d.get_gender(first_name)
-
-    if "female" in guess: return "Female"
-    if "male" in guess: return "Male"
-    return "Uncertain"
-
+    return demographics.predict(real_name)
+
+def enrich_demographics(results):
+    """Adds metadata["demographics"] to every titled hit with one batch classification."""
+    pending = [r["metadata"] for r in results.values()
+               if isinstance(r, dict) and (r.get("metadata") or {}).get("title")
+               and "demographics" not in r["metadata"]]
+    if pending:
+        labels = demographics.predict_many([m["title"] for m in pending])
+        for meta in pending:
+            meta["demographics"] = labels[meta["title"]]
+
+@cached("wayback", key=lambda url: url)
 def check_wayback_machine(url):
     """
     2. Time Machine: Checks Internet Archive for deleted profiles.
     """
     api_url = f"http://archive.org/wayback/available?url={url}"
-    try:
-        r = requests.get(api_url, timeout=3)
-        data = r.json()
-        if data.get("archived_snapshots", {}).get("closest"):
-            return data["archived_snapshots"]["closest"]["url"]
-    except:
-        pass
+    r = http_client.get(api_url, fallback_timeout=3)
+    data = r.json()
+    if data.get("archived_snapshots", {}).get("closest"):
+        return data["archived_snapshots"]["closest"]["url"]
     return None
 
-def check_gravatar_pivot(username):
+def check_wayback_batch(candidates, deadline=None):
+    """
+    Low-priority Wayback stage run after the primary scan.
+    candidates is a list of (platform_name, profile_url) for Social misses.
+    URLs are deduped, looked up concurrently, and whatever is still pending
+    after WAYBACK_BUDGET seconds, or an earlier deadline (time.monotonic()
+    value), is skipped.
+    """
+    by_url = {}
+    for name, url in candidates:
+        by_url.setdefault(url, []).append(name)
+    if not by_url:
+        return {}
+    budget_end = time.monotonic() + WAYBACK_BUDGET
+    deadline = budget_end if deadline is None else min(deadline, budget_end)
+
+    results = {}
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=WAYBACK_CONCURRENCY)
+    futures = {executor.submit(check_wayback_machine, url): url for url in by_url}
+    try:
+        for future in concurrent.futures.as_completed(futures, timeout=max(0, deadline - time.monotonic())):
+            archive = future.result()
+            if not archive:
+                continue
+            for name in by_url[futures[future]]:
+                results[name] = {
+                    "platform": name, "url": archive, "category": "Archive",
+                    "found": True, "metadata": {"bio": "Profile deleted. Found in Wayback Machine."}
+                }
+    except concurrent.futures.TimeoutError:
+        pending = sum(1 for f in futures if not f.done())
+        print(f"[!] Wayback budget reached, skipped {pending} lookups")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+def check_gravatar_pivot(username, deadline=None):
     """
     3. Gravatar Pivot: Hashes email guesses to find a photo/profile.
+    Guesses run concurrently; any still pending after GRAVATAR_BUDGET
+    seconds, or an earlier deadline (time.monotonic() value), are skipped.
+    Returns (hit or None, conclusive): a miss is only conclusive when
+    every guess got an answer.
     """
     domains = ["gmail.com", "yahoo.com", "hotmail.com", "protonmail.com"]
-    for domain in domains:
+    budget_end = time.monotonic() + GRAVATAR_BUDGET
+    deadline = budget_end if deadline is None else min(deadline, budget_end)
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(domains))
+    futures = [executor.submit(gravatar_exists, f"{username}@{domain}", 2) for domain in domains]
+    try:
+        _, pending = concurrent.futures.wait(futures, timeout=max(0, deadline - time.monotonic()))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    if pending:
+        print(f"[!] Gravatar budget reached, skipped {len(pending)} guesses")
+
+    # First domain in list order wins, as when the guesses ran one by one
+    for domain, future in zip(domains, futures):
+        if future in pending or not future.result():
+            continue
         email = f"{username}@{domain}"
         email_hash = hashlib.md5(email.lower().encode()).hexdigest()
         url = f"https://www.gravatar.com/avatar/{email_hash}?d=404"
-        try:
-            r = requests.get(url, timeout=2)
-            if r.status_code == 200:
-                return {"found": True, "email": email, "image": url}
-        except:
-            pass
-    return None
+        return {"found": True, "email": email, "image": url}, True
+    return None, not pending
 
+@cached("github_connections", key=lambda username: username.strip().lower(), default=[])
 def get_github_connections(username):
     """
     7. Social Graph: Grabs who the target follows on GitHub.
     """
     url = f"https://api.github.com/users/{username}/following"
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=5)
-        if r.status_code == 200:
-            return [u['login'] for u in r.json()[:5]] # Return top 5
-    except:
-        pass
+    r = http_client.get(url, fallback_timeout=5)
+    if r.status_code == 200:
+        return [u['login'] for u in r.json()[:5]] # Return top 5
     return []
 
 # ==========================================
 #  SECTION 3: CORE SCRAPING & ANALYSIS
 # ==========================================
 
-def scrape_metadata(html_content, platform_name):
+def _github_created_at(soup, data):
+    time_tag = soup.find("relative-time")
+    if time_tag: data['created_at'] = time_tag.get("datetime")[:10]
+
+# Platforms whose fields live outside <head> and need a full parse
+BODY_EXTRACTORS = {"GitHub": _github_created_at}
+
+def build_metadata(head, platform_name):
     """
-    Extracts Bio, Secrets, and Dates.
+    Extracts Bio, Secrets, and Dates from a parsed <head>.
     Includes 'Bio Hunter' logic.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
     data = {'title': None, 'image': None, 'bio': None, 'secrets': [], 'created_at': None}
 
     # Standard Extraction
-    if soup.title: data['title'] = soup.title.string.strip()
-    og_img = soup.find("meta", property="og:image")
-    if og_img: data['image'] = og_img.get("content")
+    if head.title: data['title'] = head.title
+    if head.meta.get("og:image"): data['image'] = head.meta["og:image"]
 
-    desc = soup.find("meta", {"name": "description"}) or soup.find("meta", property="og:description")
-    if desc:
-        data['bio'] = desc.get("content", "")[:300]
+    desc = head.meta.get("description")
+    if desc is None: desc = head.meta.get("og:description")
+    if desc is not None:
+        data['bio'] = desc[:300]
 
         # --- BIO HUNTER LOGIC ---
         # 1. Emails
@@ -146,52 +224,197 @@ def scrape_metadata(html_content, platform_name):
         btc = re.findall(r'\b(bc1|[13])[a-zA-HJ-NP-Z0-9]{25,39}\b', data['bio'])
         if btc: data['secrets'].append(f"BTC: {btc[0]}")
 
-    # --- TIMELINE LOGIC ---
-    if platform_name == "GitHub":
-        time_tag = soup.find("relative-time")
-        if time_tag: data['created_at'] = time_tag.get("datetime")[:10]
-
     return data
 
-def check_single_platform(p, username):
-    url = p["url"].format(username)
-    check_type = p.get("check_type", "status_code")
+def scrape_metadata(html_content, platform_name):
+    """Metadata from an already-downloaded page (head-only unless the platform needs the body)."""
+    head, _, _, _ = parse_head(iter_text(html_content))
+    data = build_metadata(head, platform_name)
+    if platform_name in BODY_EXTRACTORS:
+        soup, _ = full_soup(html_content)
+        BODY_EXTRACTORS[platform_name](soup, data)
+    return data
 
+def scrape_metadata_stream(response, platform_name, text=None, prefix=None, body_bytes=None):
+    """
+    Streams the profile page and stops at </head> (or the byte cap) unless
+    the platform needs a body field. Returns (metadata, fetch_stats) where
+    fetch_stats records bytes downloaded and parse time for the probe.
+    text is a body that was already fully downloaded; prefix is the start
+    of a body that is still being streamed. body_bytes is what either of
+    them took off the wire, when it wasn't read through response.content.
+    """
+    if text is not None:
+        head, seen, _, parse_ms = parse_head(iter_text(text))
+        downloaded = len(response.content) if body_bytes is None else body_bytes
+    else:
+        head, seen, downloaded, parse_ms = read_head(response, prefix=prefix)
+        downloaded += body_bytes or 0
+        if prefix and len(seen) < len(prefix):
+            seen = prefix
+    data = build_metadata(head, platform_name)
+    mode = "head"
+
+    # --- TIMELINE LOGIC (full parse fallback) ---
+    if platform_name in BODY_EXTRACTORS:
+        if text is None:
+            text, rest = read_rest(response, seen)
+            downloaded += rest
+        soup, soup_ms = full_soup(text)
+        parse_ms += soup_ms
+        BODY_EXTRACTORS[platform_name](soup, data)
+        mode = "full"
+
+    return data, {"bytes": downloaded, "parse_ms": round(parse_ms, 2), "mode": mode}
+
+def normalize_username(username):
+    return username.strip().lstrip("@").lower()
+
+def probe_status(p, username, state, reason, retry_after=None):
+    """Result for a probe that got no real answer, so it is not read as "not found"."""
+    return {
+        "platform": p.name, "url": p.url_for(username), "category": p.category,
+        "found": False, "state": state, "reason": reason, "retry_after": retry_after
+    }
+
+def _cache_key(p, username):
+    return f"{p.name}:{normalize_username(username)}"
+
+def _guarded_probe(p, username, load):
     try:
-        r = requests.get(url, headers=HEADERS, timeout=6)
-        exists = False
-
-        if check_type == "status_code" and r.status_code == 200: exists = True
-        elif check_type == "string_match" and r.status_code == 200 and p.get("error_msg") not in r.text: exists = True
+        return load()
+    except ThrottledError as e:
+        return probe_status(p, username, e.state, e.reason, e.retry_after)
+    except Exception as e:
+        return probe_status(p, username, host_guard.ERROR, str(e) or type(e).__name__)
 
-        if exists:
-            meta = scrape_metadata(r.text, p["name"])
-
-            # Run Deep Scans on specific platforms
-            if p["name"] == "GitHub":
-                meta["connections"] = get_github_connections(username)
-
-            if meta.get("title"):
-                meta["demographics"] = predict_demographics(meta["title"])
-
-            # --- KEY FIX HERE: Changed "exists": True to "found": True ---
-            return {
-                "platform": p["name"], "url": url, "category": p["category"],
-                "found": True, "metadata": meta, "avatar": meta.get("image")
-            }
-
-        # 5. Fallback: Check Wayback Machine for 'Social' sites if not found
-        elif p["category"] == "Social":
-            archive = check_wayback_machine(url)
-            if archive:
-                return {
-                    "platform": p["name"], "url": archive, "category": "Archive",
-                    "found": True, "metadata": {"bio": "Profile deleted. Found in Wayback Machine."}
-                }
+def check_single_platform(p, username):
+    """
+    Cached front for probe_platform, behind the host rate limiter and the
+    platform circuit breaker. Only completed probes are cached; throttled
+    and failed probes come back as a probe_status() result instead.
+    """
+    key = _cache_key(p, username)
+    return _guarded_probe(p, username, lambda: platform_cache.get_or_load(
+        key, lambda: host_guard.guarded(p.name, p.host, lambda: probe_platform(p, username))))
 
-    except:
-        pass
-    return None
+def recheck_platform(p, username, prior=None):
+    """
+    Uncached probe for incremental re-scans (the point is a fresh answer).
+    A prior hit is revalidated with its ETag/Last-Modified, and the shared
+    cache entry is refreshed with the outcome. A 304 is answered with the
+    stored hit's data; only full results are cached, never the 304 marker.
+    """
+    key = _cache_key(p, username)
+
+    def load():
+        res = host_guard.guarded(p.name, p.host, lambda: probe_platform(p, username, prior))
+        if res and res.get("not_modified"):
+            stored = platform_cache.get(key)
+            base = stored if isinstance(stored, dict) and stored.get("found") else prior
+            base = {k: v for k, v in base.items() if k != "not_modified"}
+            platform_cache.set(key, base)
+            return {**base, "not_modified": True, "fetch_stats": res["fetch_stats"]}
+        platform_cache.set(key, res)
+        return res
+    return _guarded_probe(p, username, load)
+
+def _raise_if_throttled(p, response):
+    reason = host_guard.throttle_reason(response)
+    if reason:
+        raise ThrottledError(p.name, reason, host_guard.parse_retry_after(response.headers.get("Retry-After")))
+
+def _conditional_headers(prior):
+    """If-None-Match/If-Modified-Since from a prior live hit's validators."""
+    if not prior or not prior.get("found") or prior.get("category") == "Archive":
+        return {}
+    validators = prior.get("validators") or {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+def _range_complete(response, read):
+    """True when a 206 body is the whole resource (Content-Range total within what was read)."""
+    total = response.headers.get("Content-Range", "").rpartition("/")[2]
+    return total.isdigit() and int(total) <= read
+
+def probe_platform(p, username, prior=None):
+    """prior: this platform's result from an earlier scan, revalidated when it was a hit."""
+    url = p.url_for(username)
+    check_type = p.check_type
+    mode = p.probe
+    max_bytes = p.max_bytes or PROBE_MAX_BYTES
+    conditional = _conditional_headers(prior)
+
+    # HEAD decides misses without any body; hits still GET the page for metadata.
+    # Sites that reject HEAD (405/501) fall through to the normal GET.
+    if mode == "head" and check_type == "status_code" and not conditional:
+        h = http_client.head(url, hedge=True)
+        if h.status_code not in (405, 501):
+            _raise_if_throttled(p, h)
+            if h.status_code != 200:
+                return None
+
+    headers = dict(conditional)
+    if mode == "range":
+        headers["Range"] = f"bytes=0-{max_bytes - 1}"
+
+    # Streamed so misses and head-only scrapes never download the full body
+    with http_client.get(url, stream=True, headers=headers or None, hedge=True) as r:
+        _raise_if_throttled(p, r)
+        if conditional and r.status_code == 304:
+            # Unchanged since the last scan: keep its metadata, nothing downloaded
+            return {**prior, "not_modified": True, "fetch_stats": {"bytes": 0, "parse_ms": 0, "mode": "304"}}
+        validators = {k: v for k, v in (("etag", r.headers.get("ETag")),
+                                        ("last_modified", r.headers.get("Last-Modified"))) if v}
+        ok = r.status_code == 200 or (mode == "range" and r.status_code == 206)
+        exists = False
+        text = None
+        prefix = None
+        body_bytes = None
+
+        if check_type == "status_code" and ok: exists = True
+        elif check_type == "string_match" and ok:
+            if mode in ("stream", "range"):
+                # Stop as soon as the "not found" marker shows up or the byte cap is hit
+                marker_found, prefix, body_bytes, complete = stream_find(r, p.error_msg, max_bytes)
+                if r.status_code == 206 and not marker_found:
+                    complete = _range_complete(r, body_bytes)
+                if marker_found or complete:
+                    exists = not marker_found
+                    if complete:
+                        text, prefix = prefix, None
+                elif r.status_code == 206:
+                    # Only the first max_bytes were sent; the marker may come later
+                    return probe_status(p, username, INCONCLUSIVE, f"marker not in the first {max_bytes} bytes")
+                else:
+                    # Past the cap with no marker yet: only the whole body can rule it out
+                    text, rest = read_rest(r, prefix)
+                    body_bytes += rest
+                    prefix = None
+                    exists = p.error_msg not in text
+            else:
+                text = r.text
+                exists = p.error_msg not in text
+
+        if not exists:
+            # Wayback fallback for Social misses runs later (check_wayback_batch)
+            return None
+        meta, fetch_stats = scrape_metadata_stream(r, p.name, text, prefix, body_bytes)
+
+    # Run Deep Scans on specific platforms
+    if p.name == "GitHub":
+        meta["connections"] = get_github_connections(username)
+
+    # --- KEY FIX HERE: Changed "exists": True to "found": True ---
+    return {
+        "platform": p.name, "url": url, "category": p.category,
+        "found": True, "metadata": meta, "avatar": meta.get("image"),
+        "fetch_stats": fetch_stats, "validators": validators
+    }
 
 def generate_radar_stats(results):
     """
@@ -200,6 +423,7 @@ def generate_radar_stats(results):
     stats = {"Social": 0, "Dev": 0, "Contact": 0, "Breach": 0, "Geo": 0}
 
     for r in results.values():
+        if not isinstance(r, dict): continue # _alts_generated etc.
         cat = r.get("category", "")
 
         if cat == "Social": stats["Social"] += 20
@@ -218,21 +442,108 @@ def generate_radar_stats(results):
     for k in stats: stats[k] = min(stats[k], 150) # Your chart goes to 150
     return stats
 
+def summarize_fetch_stats(results):
+    """Per-scan bandwidth and parse cost, from each hit's fetch_stats."""
+    per_platform = {name: r["fetch_stats"] for name, r in results.items()
+                    if isinstance(r, dict) and r.get("fetch_stats")}
+    return {
+        "bytes": sum(s["bytes"] for s in per_platform.values()),
+        "parse_ms": round(sum(s["parse_ms"] for s in per_platform.values()), 2),
+        "platforms": per_platform
+    }
+
 # --- MAIN RUNNER ---
 
-def check_username(username):
-    platforms = load_platforms()
+def check_username(username, global_limit=None, per_host_limit=None,
+                   on_total=None, on_result=None, cancel_event=None, deadline=None, top_n=None,
+                   prior=None):
+    """
+    Platforms are probed in expected-value order (historical hit rate over
+    median latency); top_n limits a quick scan to the best N of them.
+    on_total(count) and on_result(platform, result) let callers report
+    per-platform progress; cancel_event stops probes that have not started.
+    At deadline (time.monotonic()) unfinished probes are reported as
+    timed_out and the hits found so far are returned.
+    Social misses are returned under "_wayback_candidates" for the
+    deferred check_wayback_batch stage; throttled/degraded/failed probes
+    are reported under "_probe_status" rather than as misses.
+    prior (an earlier investigation of the same username) makes the scan
+    incremental: platforms answered within their freshness window keep
+    their previous result ("_reused") and only the rest are re-probed.
+    """
+    platforms = priority.order(load_platforms())
+    probe = check_single_platform
+    prior_results = {}
+    checked = {}
+    fresh = {}
+    if prior:
+        prior_results = prior.get("username_results") or {}
+        checked = rescan.checked_times(prior, [p.name for p in platforms] + ["Gravatar"])
+        platforms, fresh = rescan.plan(platforms, checked)
+        probe = lambda p, u: recheck_platform(p, u, prior_results.get(p.name))
+    if top_n:
+        platforms = platforms[:top_n]
     results = {}
-
-    # 1. MAIN SCAN
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {executor.submit(check_single_platform, p, username): p["name"] for p in platforms}
-        for future in concurrent.futures.as_completed(futures):
-            res = future.result()
-            if res: results[res["platform"]] = res
-
-    # 2. GRAVATAR PIVOT
-    grav = check_gravatar_pivot(username)
+    probe_states = {}
+    reported = set()
+    wayback_candidates = []
+    if on_total:
+        on_total(len(platforms))
+
+    def collect(p, res):
+        reported.add(p.name)
+        if res is SKIPPED:
+            # Not an answer: no checked_at, no Wayback fallback, re-probed next time
+            probe_states[p.name] = probe_status(p, username, CANCELLED, "scan cancelled")
+            res = None
+        elif res is not None and res.get("state"):
+            probe_states[p.name] = res
+            res = None
+        elif res is None and p.category == "Social":
+            wayback_candidates.append((p.name, p.url_for(username)))
+        if on_result:
+            on_result(p, res)
+
+    # 1. MAIN SCAN (asyncio engine, bounded by the slowest platform)
+    engine = ScanEngine(global_limit=global_limit, per_host_limit=per_host_limit)
+    for res in engine.run(platforms, username, probe, collect, cancel_event, deadline):
+        if not res.get("state"):
+            results[res["platform"]] = res
+    for p in platforms:
+        if p.name not in reported:
+            probe_states[p.name] = probe_status(p, username, TIMED_OUT, "scan deadline reached")
+    probed = [p.name for p in platforms] if top_n or prior else None
+    if not (cancel_event and cancel_event.is_set()):
+        priority.record_scan(list(results), probed, list(probe_states))
+
+    # Names from the whole scan are classified together, off the probe workers
+    enrich_demographics(results)
+
+    scanned_at = rescan.iso()
+    checked_at = {p.name: scanned_at for p in platforms if p.name in reported and p.name not in probe_states}
+    fetched = dict(results)
+
+    # Incremental: fresh platforms keep their last answer, and earlier hits
+    # whose re-probe got no answer are kept rather than dropped
+    reused = list(fresh)
+    for name in reused:
+        checked_at[name] = rescan.iso(fresh[name])
+    for name in reused + list(probe_states):
+        if isinstance(prior_results.get(name), dict) and prior_results[name].get("found"):
+            results[name] = prior_results[name]
+
+    # 2. GRAVATAR PIVOT (skipped once cancelled or too close to the deadline, or still fresh)
+    cancelled = cancel_event is not None and cancel_event.is_set()
+    grav = None
+    if prior and rescan.is_fresh(checked.get("Gravatar"), "Contact"):
+        reused.append("Gravatar")
+        checked_at["Gravatar"] = rescan.iso(checked["Gravatar"])
+        if prior_results.get("Gravatar"):
+            results["Gravatar"] = prior_results["Gravatar"]
+    elif not cancelled and (deadline is None or deadline - time.monotonic() >= GRAVATAR_MIN_TIME):
+        grav, answered = check_gravatar_pivot(username, deadline)
+        if answered or grav:
+            checked_at["Gravatar"] = rescan.iso()
     if grav:
         results["Gravatar"] = {
             "platform": "Gravatar", "url": grav["image"], "category": "Contact",
@@ -255,12 +566,19 @@ def check_username(username):
 
     # 5. GENERATE RADAR DATA
     results["_radar_stats"] = generate_radar_stats(results)
+    results["_fetch_stats"] = summarize_fetch_stats(fetched)
+    results["_wayback_candidates"] = wayback_candidates
+    results["_probe_status"] = probe_states
+    results["_probed"] = probed
+    results["_checked_at"] = checked_at
+    results["_reused"] = reused
 
     return results
 
 if __name__ == "__main__":
     target = input("Username: ")
     data = check_username(target)
+    data.update(check_wayback_batch(data.pop("_wayback_candidates", [])))
 
     print(json.dumps(data, indent=2, default=str))
 
@@ -0,0 +1,60 @@
+import io
+import unittest
+from unittest import mock
+
+import requests
+
+from osint_modules import username_osint
+from osint_modules.platform_registry import registry
+
+
+def fake_response(body, status=200, headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r.raw = io.BytesIO(body)
+    r.headers.update(headers or {"Content-Type": "text/html; charset=utf-8"})
+    r.encoding = "utf-8"
+    return r
+
+
+PAGE = b"<html><head><title>alice</title><meta property='og:image' content='https://x/a.png'></head><body>profile</body></html>"
+
+
+class StreamProbeTest(unittest.TestCase):
+    """string_match platforms probed in stream mode (platforms.json "probe": "stream")."""
+
+    def setUp(self):
+        username_osint.platform_cache.clear()
+
+    def probe(self, name, body, **kwargs):
+        p = registry.get(name)
+        self.assertEqual(p.probe, "stream")
+        with mock.patch.object(username_osint.http_client, "get", return_value=fake_response(body, **kwargs)):
+            return username_osint.check_single_platform(p, "alice")
+
+    def test_short_page_without_marker_is_found(self):
+        for name in ("Telegram", "Instagram", "Reddit", "Steam"):
+            res = self.probe(name, PAGE)
+            self.assertTrue(res and res.get("found"), f"{name}: {res}")
+            self.assertEqual(res["fetch_stats"]["bytes"], len(PAGE))
+            self.assertEqual(res["metadata"].get("title"), "alice")
+
+    def test_marker_is_a_miss(self):
+        p = registry.get("Reddit")
+        self.assertIsNone(self.probe("Reddit", PAGE.replace(b"profile", p.error_msg.encode())))
+
+    def test_marker_past_the_cap_is_a_miss(self):
+        p = registry.get("Telegram")
+        body = PAGE.replace(b"profile", b"x" * (p.max_bytes + 1024) + p.error_msg.encode())
+        self.assertIsNone(self.probe("Telegram", body))
+
+    def test_long_page_without_marker_is_found(self):
+        p = registry.get("Telegram")
+        body = PAGE.replace(b"profile", b"x" * (p.max_bytes + 1024))
+        res = self.probe("Telegram", body)
+        self.assertTrue(res and res.get("found"), res)
+        self.assertEqual(res["fetch_stats"]["bytes"], len(body))
+
+
+if __name__ == "__main__":
+    unittest.main()